@@ -1,3 +1,4 @@
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -6,6 +7,46 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Max number of Supabase sub -> local user id mappings kept in memory
+    USER_ID_CACHE_SIZE: int = 10000
+
+    # Food entries older than this many days are moved to Parquet files
+    ARCHIVE_DIR: str = "archive"
+    ARCHIVE_HORIZON_DAYS: int = 365
+
+    # Compiled-SQL cache entries per engine (SQLAlchemy default is 500)
+    DB_QUERY_CACHE_SIZE: int = 1200
+
+    # Read replicas as a JSON list, e.g. '["postgresql://...", "postgresql://..."]'
+    DATABASE_REPLICA_URLS: List[str] = []
+    # Reads go to the primary for this long after a client writes (read-your-writes, via cookie)
+    REPLICA_STICKY_SECONDS: float = 5.0
+    # A failed replica is skipped for this long before being tried again
+    REPLICA_RETRY_SECONDS: float = 30.0
+
+    # Redis URL for fanning live events out across workers; unset = single process
+    EVENTS_BACKEND_URL: Optional[str] = None
+    # Seconds between keep-alive comments on idle event streams
+    STREAM_KEEPALIVE_SECONDS: float = 15.0
+
+    # Logging (see app/core/logging_config.py)
+    LOG_LEVEL: str = "WARNING"
+    # Fraction of below-WARNING records kept; per path prefix as JSON, e.g. '{"/api/foods": 0.1}'
+    LOG_SAMPLE_RATE: float = 1.0
+    LOG_ROUTE_SAMPLE_RATES: Dict[str, float] = {}
+    # Each distinct warning/error message is logged at most this often per window
+    LOG_ERROR_RATE_LIMIT: int = 10
+    LOG_ERROR_RATE_WINDOW: float = 60.0
+
+    # Each worker's similar-foods index is rebuilt at least this often
+    FOOD_INDEX_MAX_AGE_SECONDS: float = 600.0
+
+    # Food autocomplete: users whose ranked foods are cached, and foods kept per user
+    SUGGEST_CACHE_SIZE: int = 5000
+    SUGGEST_TOP_FOODS: int = 200
+    # Rankings are rebuilt after this long, so writes on other workers show up
+    SUGGEST_CACHE_TTL_SECONDS: float = 60.0
+
     class Config:
         env_file = ".env"
 
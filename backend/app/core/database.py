@@ -1,18 +1,154 @@
-from sqlalchemy import create_engine
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from .config import settings
-from fastapi import Depends
-from typing import Generator
+from fastapi import Depends, Request, Response
+from typing import Dict, Generator, List, Optional
+
+def _engine_options() -> dict:
+    """Shared engine options: a compiled-SQL cache sized for the prebuilt statement variants."""
+    return {"query_cache_size": settings.DB_QUERY_CACHE_SIZE}
 
 # SQLAlchemy setup
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_engine(settings.DATABASE_URL, **_engine_options())
+replica_engines = [
+    create_engine(url, pool_pre_ping=True, **_engine_options()) for url in settings.DATABASE_REPLICA_URLS
+]
 Base = declarative_base()
 
+# Requests with these methods are served from a replica when one is available
+READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Set on responses to requests that wrote; holds the time until which reads use the primary
+PRIMARY_COOKIE = "primary_until"
+
+class ReplicaRouter:
+    """
+    Picks a replica for read-only sessions.
+
+    WHY round-robin: Spreads reads evenly without tracking replica load
+    """
+
+    def __init__(self, replicas: List[Engine], retry_seconds: float):
+        self.replicas = replicas
+        self.retry_seconds = retry_seconds
+        self._turn = itertools.count()
+        self._down_until: Dict[Engine, float] = {}
+        self._lock = threading.Lock()
+
+    def healthy_replicas(self) -> List[Engine]:
+        """Replicas to try in order, starting from the next in the rotation."""
+        if not self.replicas:
+            return []
+        now = time.monotonic()
+        with self._lock:
+            start = next(self._turn) % len(self.replicas)
+            ordered = self.replicas[start:] + self.replicas[:start]
+            return [r for r in ordered if self._down_until.get(r, 0.0) <= now]
+
+    def mark_down(self, replica: Engine) -> None:
+        with self._lock:
+            self._down_until[replica] = time.monotonic() + self.retry_seconds
+
+replica_router = ReplicaRouter(replica_engines, settings.REPLICA_RETRY_SECONDS)
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to a replica when info["read_only"] is set.
+
+    Flushes (writes) always go to the primary. The replica is chosen on the
+    first read and kept for the rest of the session, so one request sees a
+    single consistent snapshot. An unreachable replica is marked down and the
+    next one (or the primary) is used instead. A statement that fails on the
+    replica mid-request is retried once on the primary; rows already streamed
+    from a replica result are not.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.info.get("read_only") and not self._flushing:
+            replica = self._replica_bind()
+            if replica is not None:
+                return replica
+        return engine
+
+    def _replica_bind(self) -> Optional[Engine]:
+        if "replica" in self.info:
+            return self.info["replica"]
+
+        self.info["replica"] = None
+        for replica in replica_router.healthy_replicas():
+            try:
+                self.connection(bind_arguments={"bind": replica})
+            except OperationalError:
+                replica_router.mark_down(replica)
+                continue
+            self.info["replica"] = replica
+            break
+        return self.info["replica"]
+
+    def execute(self, *args, **kw):
+        try:
+            return super().execute(*args, **kw)
+        except OperationalError:
+            replica = self.info.get("replica")
+            if replica is None:
+                raise
+            # Replica dropped mid-request: finish the request on the primary
+            replica_router.mark_down(replica)
+            self.rollback()
+            self.info["replica"] = None
+            return super().execute(*args, **kw)
+
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
+
+@event.listens_for(SessionLocal, "after_flush")
+def _record_write(session, flush_context):
+    """
+    Tell the client to read from the primary for a short window.
+
+    WHY a cookie: The client's next request may land on any worker, so
+    read-your-writes can't rely on per-process state. Browser clients on
+    another origin must send credentials (axios withCredentials) and be in
+    the CORS allow_origins list, or the cookie is dropped.
+    """
+    response = session.info.get("response")
+    if response is not None:
+        until = time.time() + settings.REPLICA_STICKY_SECONDS
+        response.set_cookie(
+            PRIMARY_COOKIE,
+            f"{until:.3f}",
+            max_age=max(int(settings.REPLICA_STICKY_SECONDS), 1),
+            httponly=True,
+            samesite="lax"
+        )
+
+def _wants_primary(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+@contextmanager
+def use_primary(db: Session):
+    """Temporarily route a read-only session's queries to the primary."""
+    read_only = db.info.get("read_only", False)
+    db.info["read_only"] = False
+    try:
+        yield db
+    finally:
+        db.info["read_only"] = read_only
+
 # Dependency to get the database session
-def get_db() -> Generator:
+def get_db(request: Request, response: Response) -> Generator:
     db = SessionLocal()
+    db.info["read_only"] = request.method in READ_ONLY_METHODS and not _wants_primary(request)
+    db.info["response"] = response
     try:
         yield db
     finally:
@@ -20,7 +156,7 @@ def get_db() -> Generator:
 
 def create_tables():
     """Create all database tables"""
-    from app.models import User, Food, Meal, FoodEntry
-    
+    from app.models import User, Food, Meal, FoodEntry, DailyRollup, SyncTombstone, FoodUsage, AnalyticsSummary
+
     Base.metadata.create_all(bind=engine)
-    print("✅ Database tables created successfully!")
\ No newline at end of file
+    print("✅ Database tables created successfully!")
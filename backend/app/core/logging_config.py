@@ -0,0 +1,157 @@
+"""
+Non-blocking, sampled application logging.
+
+Request handlers only put records on an in-memory queue; a listener thread
+writes them out. A record is formatted as a JSON line on the calling thread
+(the stdlib QueueHandler.prepare), so its arguments are captured as they were
+when logged; "%s"-style arguments still cost nothing when a record is
+dropped by level, sampling or rate limiting, since filters run first.
+
+- Per-route sampling: below WARNING, only a fraction of a route's records
+  are kept (LOG_SAMPLE_RATE, overridden per path prefix by
+  LOG_ROUTE_SAMPLE_RATES).
+- Error rate limiting: each distinct WARNING+ message is emitted at most
+  LOG_ERROR_RATE_LIMIT times per LOG_ERROR_RATE_WINDOW seconds, with a count
+  of what was suppressed.
+
+Call setup_logging() once at startup and use logging.getLogger(__name__).
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from .config import settings
+
+# Path of the request being handled, set by the middleware in main.py
+current_route: ContextVar[Optional[str]] = ContextVar("current_route", default=None)
+
+class RouteContextFilter(logging.Filter):
+    """Stamp each record with the current route (runs in the caller's context)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.route = current_route.get()
+        return True
+
+class SamplingFilter(logging.Filter):
+    """Keep a per-route fraction of records below WARNING."""
+
+    def __init__(self, default_rate: float, route_rates: Dict[str, float]):
+        super().__init__()
+        self.default_rate = default_rate
+        # Longest prefix first so "/api/foods/suggest" beats "/api/foods"
+        self.route_rates = sorted(route_rates.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def rate_for(self, route: Optional[str]) -> float:
+        if route:
+            for prefix, rate in self.route_rates:
+                if route.startswith(prefix):
+                    return rate
+        return self.default_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate_for(getattr(record, "route", None))
+        return rate >= 1.0 or random.random() < rate
+
+class RateLimitFilter(logging.Filter):
+    """
+    Emit each WARNING+ message template at most `limit` times per `window` seconds.
+
+    WHY per template: A failing upstream (e.g. JWKS) produces the same error on
+    every request; one line per window plus a suppressed count is enough.
+
+    At most `max_keys` templates are tracked; f-string messages are each their
+    own template, so expired windows are dropped, then the oldest.
+    """
+
+    def __init__(self, limit: int, window: float, max_keys: int = 1000):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        # key -> [window start, emitted, suppressed], oldest window first
+        self._counts: Dict[Tuple[str, str], list] = {}
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float) -> None:
+        self._counts = {
+            key: state for key, state in self._counts.items()
+            if now - state[0] < self.window
+        }
+        while len(self._counts) >= self.max_keys:
+            del self._counts[next(iter(self._counts))]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING or self.limit <= 0:
+            return True
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            state = self._counts.get(key)
+            if state is None or now - state[0] >= self.window:
+                suppressed = state[2] if state else 0
+                # Re-insert so the dict stays ordered by window start
+                self._counts.pop(key, None)
+                if len(self._counts) >= self.max_keys:
+                    self._evict(now)
+                self._counts[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if state[1] < self.limit:
+                state[1] += 1
+                return True
+            state[2] += 1
+            return False
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, route, message (+ exception)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "route": getattr(record, "route", None),
+            "message": record.getMessage(),
+        }
+        if getattr(record, "suppressed", 0):
+            entry["suppressed"] = record.suppressed
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def setup_logging() -> None:
+    """Route all logging through a queue and a background writer thread."""
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    # Records arrive already formatted by the queue handler
+    output = logging.StreamHandler()
+    output.setFormatter(logging.Formatter("%(message)s"))
+
+    handler = logging.handlers.QueueHandler(log_queue)
+    handler.setFormatter(JSONFormatter())
+    handler.addFilter(RouteContextFilter())
+    handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_RATE, settings.LOG_ROUTE_SAMPLE_RATES))
+    handler.addFilter(RateLimitFilter(settings.LOG_ERROR_RATE_LIMIT, settings.LOG_ERROR_RATE_WINDOW))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
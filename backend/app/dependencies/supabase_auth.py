@@ -1,11 +1,16 @@
 import httpx
 from jose import jwt, jwk, JWTError
 from jose.utils import base64url_decode
-from fastapi import Request, HTTPException
+from fastapi import Request, HTTPException, Depends
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.models.user import User
 from app.schemas.user import UserJWT
+from app.services.user import get_or_create_user_id
 import logging
 
-logging.basicConfig(level=logging.WARNING)
+# Configured once by app.core.logging_config.setup_logging(); use %-style args so
+# dropped records are never formatted
 logger = logging.getLogger(__name__)
 
 # Updated JWKS URL for new signing keys
@@ -21,28 +26,23 @@ async def get_jwks():
     async with httpx.AsyncClient() as client:
         response = await client.get(JWKS_URL)
         if response.status_code != 200:
-            logger.error(f"Failed to fetch JWKS: {response.status_code}")
+            logger.error("Failed to fetch JWKS: %s", response.status_code)
             raise HTTPException(status_code=500, detail="Could not fetch JWKS")
         _jwks_cache = response.json()
-        logger.info(f"JWKS fetched successfully. Keys: {len(_jwks_cache.get('keys', []))}")
+        logger.info("JWKS fetched successfully. Keys: %d", len(_jwks_cache.get('keys', [])))
         return _jwks_cache
 
 async def get_current_user(request: Request) -> UserJWT:
     auth_header = request.headers.get("Authorization")
-    logger.info(f"Auth header present: {bool(auth_header)}")
-    
     if not auth_header or not auth_header.startswith("Bearer "):
         logger.error("Missing or invalid Authorization header")
         raise HTTPException(status_code=401, detail="Missing or invalid Authorization header")
 
     token = auth_header.split(" ")[1]
-    logger.info(f"Token length: {len(token)}")
-    
     try:
         # Get token header to identify key
         unverified_header = jwt.get_unverified_header(token)
-        logger.info(f"Token algorithm: {unverified_header.get('alg')}")
-        logger.info(f"Token key ID: {unverified_header.get('kid')}")
+        logger.debug("Token algorithm: %s, key ID: %s", unverified_header.get('alg'), unverified_header.get('kid'))
         
         # Determine verification method based on algorithm
         if unverified_header.get('alg') == 'HS256':
@@ -60,7 +60,7 @@ async def get_current_user(request: Request) -> UserJWT:
             key = next((k for k in jwks["keys"] if k["kid"] == unverified_header["kid"]), None)
             
             if not key:
-                logger.error(f"Key not found in JWKS for kid: {unverified_header['kid']}")
+                logger.error("Key not found in JWKS for kid: %s", unverified_header['kid'])
                 raise HTTPException(status_code=401, detail="Key not found in JWKS")
 
             # Construct public key and verify
@@ -72,7 +72,6 @@ async def get_current_user(request: Request) -> UserJWT:
                 audience="authenticated"
             )
         
-        logger.info(f"Token decoded successfully")
         email = payload.get("email")
         sub = payload.get("sub")
 
@@ -80,12 +79,38 @@ async def get_current_user(request: Request) -> UserJWT:
             logger.error("Email claim missing in token")
             raise HTTPException(status_code=401, detail="Email claim missing in token")
 
-        logger.info(f"User authenticated: {email}")
+        logger.debug("User authenticated: %s", email)
         return UserJWT(email=email, sub=sub)
     
     except JWTError as e:
-        logger.error(f"JWT Error: {str(e)}")
+        logger.error("JWT Error: %s", e)
         raise HTTPException(status_code=401, detail=f"JWT Error: {str(e)}")
     except Exception as e:
-        logger.error(f"Token verification failed: {str(e)}")
-        raise HTTPException(status_code=401, detail=f"Token verification failed: {str(e)}")
\ No newline at end of file
+        logger.error("Token verification failed: %s", e)
+        raise HTTPException(status_code=401, detail=f"Token verification failed: {str(e)}")
+
+def get_current_db_user(
+    current_user: UserJWT = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> UserJWT:
+    """
+    Authenticated user with the local users.id resolved from the JWT sub.
+
+    WHY: Ownership filters compare the integer Meal.user_id, so the UUID sub
+    is mapped once (and cached) instead of being compared on every query.
+    """
+    current_user.user_id = get_or_create_user_id(db, current_user.sub, current_user.email)
+    # Lets the session stamp sync versions for this user
+    db.info["user_id"] = current_user.user_id
+    return current_user
+
+
+def get_current_admin(
+    current_user: UserJWT = Depends(get_current_db_user),
+    db: Session = Depends(get_db)
+) -> UserJWT:
+    """Authenticated user who must be marked is_superuser in the local users table."""
+    is_superuser = db.query(User.is_superuser).filter(User.id == current_user.user_id).scalar()
+    if not is_superuser:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
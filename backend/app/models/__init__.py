@@ -1,6 +1,6 @@
 # Import all models so they're registered with SQLAlchemy
 from .user import User
-from .nutrition import Food, Meal, FoodEntry
+from .nutrition import Food, Meal, FoodEntry, DailyRollup, SyncTombstone, FoodUsage, AnalyticsSummary
 
 # Export them so other files can import easily
-__all__ = ["User", "Food", "Meal", "FoodEntry"]
\ No newline at end of file
+__all__ = ["User", "Food", "Meal", "FoodEntry", "DailyRollup", "SyncTombstone", "FoodUsage", "AnalyticsSummary"]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, BigInteger, String, Float, Date, ForeignKey, DateTime, Index, UniqueConstraint, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -22,18 +22,36 @@ class Food(Base):
     
     food_entries = relationship("FoodEntry", back_populates="food")
 
+# Case-insensitive prefix search (autocomplete) can use this index;
+# text_pattern_ops lets Postgres use it for LIKE 'abc%' under any collation
+Index(
+    "ix_foods_name_lower",
+    func.lower(Food.name).label("name_lower"),
+    postgresql_ops={"name_lower": "text_pattern_ops"}
+)
+
 class Meal(Base):
     __tablename__ = "meals"
     
+    # Every meal query filters by owner first, usually together with a date
+    __table_args__ = (
+        Index("ix_meals_user_id_date", "user_id", "date"),
+        Index("ix_meals_user_id_version", "user_id", "version"),
+    )
+    
     id = Column(Integer, primary_key=True, index=True)
     
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     
     date = Column(Date, nullable=False, index=True)  
     
     meal_type = Column(String, nullable=False)
     
     created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    
+    # Per-user change version, stamped by app.services.sync on every write
+    version = Column(BigInteger, nullable=False, default=0)
     
     user = relationship("User", back_populates="meals")
     
@@ -44,8 +62,8 @@ class FoodEntry(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     
-    meal_id = Column(Integer, ForeignKey("meals.id"), nullable=False)
-    food_id = Column(Integer, ForeignKey("foods.id"), nullable=False)
+    meal_id = Column(Integer, ForeignKey("meals.id"), nullable=False, index=True)
+    food_id = Column(Integer, ForeignKey("foods.id"), nullable=False, index=True)
     
     quantity_grams = Column(Float, nullable=False)
     
@@ -55,6 +73,79 @@ class FoodEntry(Base):
     total_carbs = Column(Float, nullable=False)
     total_fat = Column(Float, nullable=False)
     
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    version = Column(BigInteger, nullable=False, default=0, index=True)
+    
     # Relationships
     meal = relationship("Meal", back_populates="food_entries")
-    food = relationship("Food", back_populates="food_entries")
\ No newline at end of file
+    food = relationship("Food", back_populates="food_entries")
+
+class DailyRollup(Base):
+    """Per-meal totals kept online after the entries are archived."""
+    __tablename__ = "daily_rollups"
+    
+    __table_args__ = (
+        UniqueConstraint("user_id", "date", "meal_type", name="uq_daily_rollups_user_date_type"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    date = Column(Date, nullable=False)
+    meal_type = Column(String, nullable=False)
+    
+    total_calories = Column(Float, nullable=False, default=0.0)
+    total_protein = Column(Float, nullable=False, default=0.0)
+    total_carbs = Column(Float, nullable=False, default=0.0)
+    total_fat = Column(Float, nullable=False, default=0.0)
+    entry_count = Column(Integer, nullable=False, default=0)
+
+
+class SyncTombstone(Base):
+    """Records a deleted meal or food entry so syncing clients can drop it."""
+    __tablename__ = "sync_tombstones"
+    
+    __table_args__ = (
+        Index("ix_sync_tombstones_user_id_version", "user_id", "version"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    entity = Column(String, nullable=False)  # "meal" or "food_entry"
+    entity_id = Column(Integer, nullable=False)
+    version = Column(BigInteger, nullable=False)
+    
+    deleted_at = Column(DateTime, server_default=func.now())
+
+
+class FoodUsage(Base):
+    """How often and how recently a user logged each food, for autocomplete ranking."""
+    __tablename__ = "food_usage"
+    
+    __table_args__ = (
+        Index("ix_food_usage_user_id_use_count", "user_id", "use_count"),
+    )
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    # Usage outlives archived/deleted entries; it must not block deleting the food
+    food_id = Column(Integer, ForeignKey("foods.id", ondelete="CASCADE"), primary_key=True)
+    
+    use_count = Column(Integer, nullable=False, default=0)
+    last_used_at = Column(DateTime, nullable=False, server_default=func.now())
+
+
+class AnalyticsSummary(Base):
+    """One run of the population analytics job (app.services.analytics)."""
+    __tablename__ = "analytics_summaries"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    
+    computed_at = Column(DateTime, server_default=func.now(), index=True)
+    workers = Column(Integer, nullable=False)
+    duration_seconds = Column(Float, nullable=False)
+    user_count = Column(Integer, nullable=False)
+    meal_count = Column(Integer, nullable=False)
+    
+    # Aggregates: per-meal-type stats, daily intake percentiles, macro split, top foods
+    summary = Column(JSON, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, Uuid
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
@@ -7,8 +7,15 @@ class User(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
-    hashed_password = Column(String, nullable=False)
+    # Nullable: Supabase users authenticate with a JWT and never set a local password
+    hashed_password = Column(String, nullable=True)
     is_active = Column(Boolean, default=True) 
     is_superuser = Column(Boolean, default=False)
 
-    meals = relationship("Meal", back_populates="user", cascade="all, delete-orphan")
\ No newline at end of file
+    # Supabase auth user ID (JWT "sub"), stored as a native UUID
+    supabase_id = Column(Uuid(as_uuid=True), unique=True, index=True, nullable=True)
+
+    # Last change version handed out to this user's meals/entries (see app.services.sync)
+    sync_version = Column(BigInteger, nullable=False, default=0, server_default="0")
+
+    meals = relationship("Meal", back_populates="user", cascade="all, delete-orphan")
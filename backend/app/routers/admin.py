@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.models.nutrition import AnalyticsSummary
+from app.schemas.nutrition import AnalyticsSummaryRead
+from app.dependencies.supabase_auth import get_current_admin
+from app.schemas.user import UserJWT
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+@router.get("/analytics", response_model=AnalyticsSummaryRead)
+def get_analytics(
+    current_user: UserJWT = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the latest population-level nutrition analytics.
+    
+    WHY precomputed: Aggregating every user's entries is a batch job
+    (python -m app.services.analytics), not something to run per request
+    """
+    summary = db.query(AnalyticsSummary).order_by(AnalyticsSummary.computed_at.desc(), AnalyticsSummary.id.desc()).first()
+    
+    if not summary:
+        raise HTTPException(status_code=404, detail="Analytics have not been computed yet")
+    
+    return summary
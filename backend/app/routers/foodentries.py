@@ -4,8 +4,11 @@ from typing import List, Optional
 from app.core.database import get_db
 from app.models.nutrition import FoodEntry, Food, Meal
 from app.schemas.nutrition import FoodEntryCreate, FoodEntryRead
-from app.dependencies.supabase_auth import get_current_user
+from app.dependencies.supabase_auth import get_current_db_user
 from app.schemas.user import UserJWT
+from app.services.events import publish_daily_totals
+from app.services.suggest import record_food_use, invalidate_ranking
+from app.services import queries
 
 router = APIRouter(prefix="/food-entries", tags=["Food Entries"])
 
@@ -31,7 +34,7 @@ def get_food_entries(
     food_id: Optional[int] = Query(None, description="Filter by food ID"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
-    current_user: UserJWT = Depends(get_current_user),
+    current_user: UserJWT = Depends(get_current_db_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -41,36 +44,18 @@ def get_food_entries(
     WHY include Food data: Frontend needs food name/details for display
     """
     # Security: Join with Meal to ensure user ownership
-    query = db.query(FoodEntry)\
-        .join(Meal)\
-        .filter(Meal.user_id == current_user.sub)
-    
-    if meal_id:
-        query = query.filter(FoodEntry.meal_id == meal_id)
-    
-    if food_id:
-        query = query.filter(FoodEntry.food_id == food_id)
-    
-    query = query.order_by(Meal.date.desc(), FoodEntry.id.desc())
-    
-    entries = query.offset(skip).limit(limit).all()
-    return entries
+    return queries.list_food_entries(db, current_user.user_id, meal_id, food_id, skip, limit)
 
 @router.get("/{entry_id}", response_model=FoodEntryRead)
 def get_food_entry(
     entry_id: int,
-    current_user: UserJWT = Depends(get_current_user),
+    current_user: UserJWT = Depends(get_current_db_user),
     db: Session = Depends(get_db)
 ):
     """
     Get a specific food entry by ID with ownership check.
     """
-    entry = db.query(FoodEntry)\
-        .join(Meal)\
-        .filter(
-            FoodEntry.id == entry_id,
-            Meal.user_id == current_user.sub  
-        ).first()
+    entry = queries.get_owned_entry(db, current_user.user_id, entry_id)
     
     if not entry:
         raise HTTPException(status_code=404, detail="Food entry not found")
@@ -80,7 +65,7 @@ def get_food_entry(
 @router.post("/", response_model=FoodEntryRead, status_code=201)
 def create_food_entry(
     entry_data: FoodEntryCreate,
-    current_user: UserJWT = Depends(get_current_user),
+    current_user: UserJWT = Depends(get_current_db_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -90,15 +75,12 @@ def create_food_entry(
     WHY validate food exists: Data integrity - can't reference non-existent food
     WHY auto-calculate nutrition: User shouldn't do math, system should
     """
-    meal = db.query(Meal).filter(
-        Meal.id == entry_data.meal_id,
-        Meal.user_id == current_user.sub  
-    ).first()
+    meal = queries.get_owned_meal(db, current_user.user_id, entry_data.meal_id)
     
     if not meal:
         raise HTTPException(status_code=404, detail="Meal not found or not accessible")
     
-    food = db.query(Food).filter(Food.id == entry_data.food_id).first()
+    food = queries.get_food(db, entry_data.food_id)
     if not food:
         raise HTTPException(status_code=404, detail="Food not found")
     
@@ -112,8 +94,11 @@ def create_food_entry(
     )
     
     db.add(new_entry)
+    record_food_use(db, current_user.user_id, entry_data.food_id)
     db.commit()
     db.refresh(new_entry)
+    invalidate_ranking(current_user.user_id)
+    publish_daily_totals(db, current_user.user_id, [meal.date])
     
     return new_entry
 
@@ -121,7 +106,7 @@ def create_food_entry(
 def update_food_entry(
     entry_id: int,
     entry_data: FoodEntryCreate,
-    current_user: UserJWT = Depends(get_current_user),
+    current_user: UserJWT = Depends(get_current_db_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -130,30 +115,26 @@ def update_food_entry(
     WHY recalculate on update: Quantity or food might change
     WHY validate new meal/food: User might change references
     """
-    entry = db.query(FoodEntry)\
-        .join(Meal)\
-        .filter(
-            FoodEntry.id == entry_id,
-            Meal.user_id == current_user.sub
-        ).first()
+    entry = queries.get_owned_entry(db, current_user.user_id, entry_id)
     
     if not entry:
         raise HTTPException(status_code=404, detail="Food entry not found")
     
+    # Moving an entry changes the totals of both the old and the new day
+    affected_days = [entry.meal.date]
+    
     if entry_data.meal_id != entry.meal_id:
-        meal = db.query(Meal).filter(
-            Meal.id == entry_data.meal_id,
-            Meal.user_id == current_user.sub
-        ).first()
+        meal = queries.get_owned_meal(db, current_user.user_id, entry_data.meal_id)
         if not meal:
             raise HTTPException(status_code=404, detail="Target meal not found or not accessible")
+        affected_days.append(meal.date)
     
     if entry_data.food_id != entry.food_id:
-        food = db.query(Food).filter(Food.id == entry_data.food_id).first()
+        food = queries.get_food(db, entry_data.food_id)
         if not food:
             raise HTTPException(status_code=404, detail="Food not found")
     
-    food = db.query(Food).filter(Food.id == entry_data.food_id).first()
+    food = queries.get_food(db, entry_data.food_id)
     
     nutrition = calculate_nutrition(food, entry_data.quantity_grams)
     
@@ -167,12 +148,13 @@ def update_food_entry(
     
     db.commit()
     db.refresh(entry)
+    publish_daily_totals(db, current_user.user_id, affected_days)
     return entry
 
 @router.delete("/{entry_id}")
 def delete_food_entry(
     entry_id: int,
-    current_user: UserJWT = Depends(get_current_user),
+    current_user: UserJWT = Depends(get_current_db_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -180,20 +162,17 @@ def delete_food_entry(
     
     WHY simple delete: No cascading needed, entries are leaf nodes
     """
-    entry = db.query(FoodEntry)\
-        .join(Meal)\
-        .filter(
-            FoodEntry.id == entry_id,
-            Meal.user_id == current_user.sub
-        ).first()
+    entry = queries.get_owned_entry(db, current_user.user_id, entry_id)
     
     if not entry:
         raise HTTPException(status_code=404, detail="Food entry not found")
     
     food_name = entry.food.name
     quantity = entry.quantity_grams
+    day = entry.meal.date
     
     db.delete(entry)
     db.commit()
+    publish_daily_totals(db, current_user.user_id, [day])
     
     return {"message": f"Deleted {quantity}g of {food_name} from meal"}
\ No newline at end of file
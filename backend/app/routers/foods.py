@@ -2,8 +2,12 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.core.database import get_db
-from app.models.nutrition import Food
-from app.schemas.nutrition import FoodCreate, FoodRead
+from app.models.nutrition import Food, FoodUsage
+from app.schemas.nutrition import FoodCreate, FoodRead, SimilarFood, FoodSuggestion
+from app.schemas.user import UserJWT
+from app.dependencies.supabase_auth import get_current_db_user
+from app.services.food_index import food_index, food_vector, parse_constraints
+from app.services.suggest import suggest_foods, ranking_cache
 
 router = APIRouter(prefix="/foods", tags=["Foods"])
 
@@ -23,6 +27,22 @@ def get_foods(
     foods = query.order_by(Food.name).offset(skip).limit(limit).all()
     return foods
 
+# Declared before /{food_id} so "suggest" isn't parsed as an ID
+@router.get("/suggest", response_model=List[FoodSuggestion])
+def suggest(
+    q: str = Query("", description="What the user has typed so far"),
+    limit: int = Query(10, ge=1, le=50, description="Number of suggestions to return"),
+    current_user: UserJWT = Depends(get_current_db_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Autocomplete foods, putting the ones this user logs most often first.
+    
+    WHY personalized: Users log the same foods daily and shouldn't scroll
+    past hundreds of alphabetical matches to find them
+    """
+    return suggest_foods(db, current_user.user_id, q, limit)
+
 @router.get("/{food_id}", response_model=FoodRead)
 def get_food(food_id: int, db: Session = Depends(get_db)):
     """Get a single food by ID."""
@@ -33,6 +53,46 @@ def get_food(food_id: int, db: Session = Depends(get_db)):
     
     return food
 
+@router.get("/{food_id}/similar", response_model=List[SimilarFood])
+def get_similar_foods(
+    food_id: int,
+    constraints: Optional[str] = Query(
+        None,
+        description="Comma-separated filters, e.g. 'fat<self,protein>=10' (self = this food's value)"
+    ),
+    limit: int = Query(10, ge=1, le=100, description="Number of foods to return"),
+    db: Session = Depends(get_db)
+):
+    """Find foods with the closest nutrient profile, optionally constrained."""
+    try:
+        parsed = parse_constraints(constraints)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    food_index.ensure_built(db)
+    source = None
+    if food_index.vector(food_id) is None:
+        # Created or updated on another worker since this index was built
+        food = db.query(Food).filter(Food.id == food_id).first()
+        if not food:
+            raise HTTPException(status_code=404, detail="Food not found")
+        source = food_vector(food)
+    
+    matches = food_index.similar(food_id, limit, parsed, source=source)
+    
+    foods = {
+        food.id: food
+        for food in db.query(Food).filter(Food.id.in_([match_id for match_id, _ in matches]))
+    }
+    return [
+        SimilarFood(
+            **FoodRead.model_validate(foods[match_id], from_attributes=True).model_dump(),
+            distance=distance
+        )
+        for match_id, distance in matches
+        if match_id in foods
+    ]
+
 @router.post("/", response_model=FoodRead, status_code=201)
 def create_food(food_data: FoodCreate, db: Session = Depends(get_db)):
     """Create a new food item."""
@@ -45,6 +105,7 @@ def create_food(food_data: FoodCreate, db: Session = Depends(get_db)):
     db.add(new_food)
     db.commit()
     db.refresh(new_food)
+    food_index.upsert(new_food)
     
     return new_food
 
@@ -74,6 +135,9 @@ def update_food(
     
     db.commit()
     db.refresh(food)
+    food_index.upsert(food)
+    # Cached suggestions hold food details; drop them rather than serve stale ones
+    ranking_cache.clear()
     return food
 
 @router.delete("/{food_id}")
@@ -92,6 +156,10 @@ def delete_food(food_id: int, db: Session = Depends(get_db)):
             detail="Cannot delete food - it's used in meals"
         )
     
+    # Usage rows outlive deleted/archived entries; clear them so the FK doesn't block the delete
+    db.query(FoodUsage).filter(FoodUsage.food_id == food_id).delete(synchronize_session=False)
     db.delete(food)
     db.commit()
+    food_index.remove(food_id)
+    ranking_cache.clear()
     return {"message": f"Food '{food.name}' deleted successfully"}
\ No newline at end of file
@@ -5,8 +5,10 @@ from datetime import date
 from app.core.database import get_db
 from app.models.nutrition import Meal
 from app.schemas.nutrition import MealCreate, MealRead, MealType
-from app.dependencies.supabase_auth import get_current_user
+from app.dependencies.supabase_auth import get_current_db_user
 from app.schemas.user import UserJWT
+from app.services.events import publish_daily_totals
+from app.services import queries
 
 router = APIRouter(prefix="/meals", tags=["Meals"])
 
@@ -16,7 +18,7 @@ def get_meals(
     meal_type: Optional[MealType] = Query(None, description="Filter by meal type"),
     skip: int = Query(0, ge=0, description="Number of records to skip for pagination"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
-    current_user: UserJWT = Depends(get_current_user),
+    current_user: UserJWT = Depends(get_current_db_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -26,23 +28,19 @@ def get_meals(
     WHY optional filters: Flexibility - sometimes you want all meals, sometimes just breakfast
     WHY pagination: Performance - large datasets need chunking
     """
-    query = db.query(Meal).filter(Meal.user_id == current_user.sub)
-    
-    if meal_date:
-        query = query.filter(Meal.date == meal_date)
-    
-    if meal_type:
-        query = query.filter(Meal.meal_type == meal_type.value)
-    
-    query = query.order_by(Meal.date.desc(), Meal.meal_type)
-    
-    meals = query.offset(skip).limit(limit).all()
-    return meals
+    return queries.list_meals(
+        db,
+        current_user.user_id,
+        meal_date,
+        meal_type.value if meal_type else None,
+        skip,
+        limit
+    )
 
 @router.get("/{meal_id}", response_model=MealRead)
 def get_meal(
     meal_id: int,
-    current_user: UserJWT = Depends(get_current_user),
+    current_user: UserJWT = Depends(get_current_db_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -50,10 +48,7 @@ def get_meal(
     
     WHY check ownership: Security - prevent users accessing others' meals
     """
-    meal = db.query(Meal).filter(
-        Meal.id == meal_id,
-        Meal.user_id == current_user.sub  
-    ).first()
+    meal = queries.get_owned_meal(db, current_user.user_id, meal_id)
     
     if not meal:
         raise HTTPException(status_code=404, detail="Meal not found")
@@ -63,7 +58,7 @@ def get_meal(
 @router.post("/", response_model=MealRead, status_code=201)
 def create_meal(
     meal_data: MealCreate,
-    current_user: UserJWT = Depends(get_current_user),
+    current_user: UserJWT = Depends(get_current_db_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -72,20 +67,14 @@ def create_meal(
     WHY auto-assign user_id: Security - can't create meals for other users
     WHY check duplicates: Business logic - prevent multiple breakfasts on same day
     """
-    existing = db.query(Meal).filter(
-        Meal.user_id == current_user.sub,
-        Meal.date == meal_data.date,
-        Meal.meal_type == meal_data.meal_type.value
-    ).first()
-    
-    if existing:
+    if queries.meal_conflict_exists(db, current_user.user_id, meal_data.date, meal_data.meal_type.value):
         raise HTTPException(
             status_code=409, 
             detail=f"You already have a {meal_data.meal_type.value} meal on {meal_data.date}"
         )
     
     new_meal = Meal(
-        user_id=current_user.sub,  
+        user_id=current_user.user_id,  
         date=meal_data.date,
         meal_type=meal_data.meal_type.value
     )
@@ -100,7 +89,7 @@ def create_meal(
 def update_meal(
     meal_id: int,
     meal_data: MealCreate,
-    current_user: UserJWT = Depends(get_current_user),
+    current_user: UserJWT = Depends(get_current_db_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -109,39 +98,35 @@ def update_meal(
     WHY check ownership first: Security before business logic
     WHY check conflicts on update: Prevent duplicate meals after editing
     """
-    meal = db.query(Meal).filter(
-        Meal.id == meal_id,
-        Meal.user_id == current_user.sub
-    ).first()
+    meal = queries.get_owned_meal(db, current_user.user_id, meal_id)
     
     if not meal:
         raise HTTPException(status_code=404, detail="Meal not found")
 
     if meal_data.date != meal.date or meal_data.meal_type.value != meal.meal_type:
-        existing = db.query(Meal).filter(
-            Meal.user_id == current_user.sub,
-            Meal.date == meal_data.date,
-            Meal.meal_type == meal_data.meal_type.value,
-            Meal.id != meal_id  
-        ).first()
-        
-        if existing:
+        if queries.meal_conflict_exists(
+            db, current_user.user_id, meal_data.date, meal_data.meal_type.value, exclude_id=meal_id
+        ):
             raise HTTPException(
                 status_code=409,
                 detail=f"You already have a {meal_data.meal_type.value} meal on {meal_data.date}"
             )
     
+    old_date = meal.date
     meal.date = meal_data.date
     meal.meal_type = meal_data.meal_type.value
     
     db.commit()
     db.refresh(meal)
+    if old_date != meal.date:
+        # The meal's entries moved from one day's totals to another's
+        publish_daily_totals(db, current_user.user_id, [old_date, meal.date])
     return meal
 
 @router.delete("/{meal_id}")
 def delete_meal(
     meal_id: int,
-    current_user: UserJWT = Depends(get_current_user),
+    current_user: UserJWT = Depends(get_current_db_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -150,15 +135,15 @@ def delete_meal(
     WHY cascade delete: When meal is gone, its entries become meaningless
     This is handled by the database relationship: cascade="all, delete-orphan"
     """
-    meal = db.query(Meal).filter(
-        Meal.id == meal_id,
-        Meal.user_id == current_user.sub
-    ).first()
+    meal = queries.get_owned_meal(db, current_user.user_id, meal_id)
     
     if not meal:
         raise HTTPException(status_code=404, detail="Meal not found")
     
+    meal_type, meal_date = meal.meal_type, meal.date
+    
     db.delete(meal)  
     db.commit()
+    publish_daily_totals(db, current_user.user_id, [meal_date])
     
-    return {"message": f"{meal.meal_type.title()} meal on {meal.date} deleted successfully"}
\ No newline at end of file
+    return {"message": f"{meal_type.title()} meal on {meal_date} deleted successfully"}
\ No newline at end of file
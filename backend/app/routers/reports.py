@@ -0,0 +1,80 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List
+from datetime import date
+from app.core.database import get_db
+from app.models.nutrition import FoodEntry, Food, Meal
+from app.schemas.nutrition import FoodEntryExport, DailyTotal
+from app.dependencies.supabase_auth import get_current_db_user
+from app.schemas.user import UserJWT
+from app.services.archive import read_archived_entries, get_daily_totals
+
+router = APIRouter(prefix="/reports", tags=["Reports"])
+
+def _check_range(start: date, end: date) -> None:
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must be on or before end")
+
+@router.get("/daily-totals", response_model=List[DailyTotal])
+def daily_totals(
+    start: date = Query(..., description="First day (inclusive)"),
+    end: date = Query(..., description="Last day (inclusive)"),
+    current_user: UserJWT = Depends(get_current_db_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get per-day nutrition totals for a date range.
+    
+    WHY no archive read: Archived days come from the daily_rollups table
+    """
+    _check_range(start, end)
+    return get_daily_totals(db, current_user.user_id, start, end)
+
+@router.get("/export", response_model=List[FoodEntryExport])
+def export_entries(
+    start: date = Query(..., description="First day (inclusive)"),
+    end: date = Query(..., description="Last day (inclusive)"),
+    current_user: UserJWT = Depends(get_current_db_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Export every food entry in a date range, oldest first.
+    
+    WHY merge: Old entries live in Parquet archives, recent ones in the database
+    WHY key by entry_id: An archive run that crashed before its commit leaves
+    entries both archived and live; the live row wins
+    """
+    _check_range(start, end)
+    
+    rows = {
+        row["entry_id"]: {**row, "archived": True}
+        for row in read_archived_entries(current_user.user_id, start, end)
+    }
+    
+    live = db.query(FoodEntry, Meal, Food.name)\
+        .join(Meal, FoodEntry.meal_id == Meal.id)\
+        .join(Food, FoodEntry.food_id == Food.id)\
+        .filter(
+            Meal.user_id == current_user.user_id,
+            Meal.date >= start,
+            Meal.date <= end
+        )\
+        .order_by(Meal.date, FoodEntry.id)
+    
+    for entry, meal, food_name in live:
+        rows[entry.id] = {
+            "entry_id": entry.id,
+            "meal_id": meal.id,
+            "date": meal.date,
+            "meal_type": meal.meal_type,
+            "food_id": entry.food_id,
+            "food_name": food_name,
+            "quantity_grams": entry.quantity_grams,
+            "total_calories": entry.total_calories,
+            "total_protein": entry.total_protein,
+            "total_carbs": entry.total_carbs,
+            "total_fat": entry.total_fat,
+            "archived": False,
+        }
+    
+    return sorted(rows.values(), key=lambda row: (row["date"], row["entry_id"]))
@@ -0,0 +1,47 @@
+import asyncio
+import json
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import get_db
+from app.dependencies.supabase_auth import get_current_db_user
+from app.schemas.user import UserJWT
+from app.services.events import broker
+
+router = APIRouter(prefix="/stream", tags=["Stream"])
+
+@router.get("/daily-totals")
+async def stream_daily_totals(
+    request: Request,
+    current_user: UserJWT = Depends(get_current_db_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Server-Sent Events stream of the user's recalculated day totals.
+    
+    Each event is a DailyTotal for a day whose entries just changed, from
+    this or any other device.
+    
+    WHY SSE: Clients wait for pushes instead of polling meals and entries
+    WHY close the session: An idle stream must not pin a database connection
+    """
+    user_id = current_user.user_id
+    db.close()
+    
+    async def events():
+        async with broker.subscribe(user_id) as queue:
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing the idle connection
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: daily-totals\ndata: {json.dumps(event)}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
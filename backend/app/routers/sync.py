@@ -0,0 +1,185 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from datetime import date
+from typing import Dict, Optional, Set
+from app.core.database import get_db
+from app.models.nutrition import FoodEntry, Meal
+from app.schemas.nutrition import MealCreate
+from app.schemas.sync import (
+    SyncResponse, SyncBatch, SyncBatchResponse, SyncOperation, SyncOperationResult,
+    SyncMealData, SyncFoodEntryData
+)
+from app.dependencies.supabase_auth import get_current_db_user
+from app.schemas.user import UserJWT
+from app.routers.foodentries import calculate_nutrition
+from app.services.sync import get_changes, parse_token
+from app.services.suggest import record_food_use, invalidate_ranking
+from app.services.events import publish_daily_totals
+from app.services import queries
+
+router = APIRouter(prefix="/sync", tags=["Sync"])
+
+@router.get("/", response_model=SyncResponse)
+def pull_changes(
+    since: Optional[str] = Query(None, description="Token from the previous sync; omit for a full download"),
+    current_user: UserJWT = Depends(get_current_db_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get meals and food entries changed since the given token.
+
+    WHY tokens: Reconnecting clients download only what changed, not their history
+    WHY tombstones: Deletes made on another device must reach this one too
+    
+    Sync covers live history only: meals moved out by the archiver arrive as
+    tombstones, and their entries stay available through /reports/export.
+    """
+    try:
+        version = parse_token(since)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+
+    return get_changes(db, current_user.user_id, version)
+
+def _owned_meal(db: Session, user_id: int, meal_id: Optional[int]) -> Meal:
+    meal = queries.get_owned_meal(db, user_id, meal_id)
+    if not meal:
+        raise HTTPException(status_code=404, detail="Meal not found or not accessible")
+    return meal
+
+def _owned_entry(db: Session, user_id: int, entry_id: Optional[int]) -> FoodEntry:
+    entry = queries.get_owned_entry(db, user_id, entry_id)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Food entry not found")
+    return entry
+
+def _check_meal_conflict(db: Session, user_id: int, meal_data: MealCreate, exclude_id: Optional[int] = None):
+    if queries.meal_conflict_exists(db, user_id, meal_data.date, meal_data.meal_type.value, exclude_id):
+        raise HTTPException(
+            status_code=409,
+            detail=f"You already have a {meal_data.meal_type.value} meal on {meal_data.date}"
+        )
+
+def _apply_meal(db: Session, user_id: int, op: SyncOperation, days: Set[date]) -> int:
+    if op.op == "delete":
+        meal = _owned_meal(db, user_id, op.id)
+        days.add(meal.date)
+        db.delete(meal)
+        db.flush()
+        return meal.id
+
+    meal_data = SyncMealData(**op.data)
+    if op.op == "create":
+        _check_meal_conflict(db, user_id, meal_data)
+        meal = Meal(user_id=user_id, date=meal_data.date, meal_type=meal_data.meal_type.value)
+        db.add(meal)
+    else:
+        meal = _owned_meal(db, user_id, op.id)
+        _check_meal_conflict(db, user_id, meal_data, exclude_id=meal.id)
+        days.update([meal.date, meal_data.date])
+        meal.date = meal_data.date
+        meal.meal_type = meal_data.meal_type.value
+
+    db.flush()
+    return meal.id
+
+def _apply_food_entry(
+    db: Session,
+    user_id: int,
+    op: SyncOperation,
+    client_meals: Dict[str, int],
+    days: Set[date]
+) -> int:
+    if op.op == "delete":
+        entry = _owned_entry(db, user_id, op.id)
+        days.add(entry.meal.date)
+        db.delete(entry)
+        db.flush()
+        return entry.id
+
+    entry_data = SyncFoodEntryData(**op.data)
+
+    # Entries queued offline may point at a meal that was also created offline
+    meal_id = entry_data.meal_id
+    if meal_id is None and entry_data.meal_client_id is not None:
+        meal_id = client_meals.get(entry_data.meal_client_id)
+    meal = _owned_meal(db, user_id, meal_id)
+    days.add(meal.date)
+
+    food = queries.get_food(db, entry_data.food_id)
+    if not food:
+        raise HTTPException(status_code=404, detail="Food not found")
+
+    nutrition = calculate_nutrition(food, entry_data.quantity_grams)
+    if op.op == "create":
+        entry = FoodEntry(
+            meal_id=meal.id,
+            food_id=entry_data.food_id,
+            quantity_grams=entry_data.quantity_grams,
+            **nutrition
+        )
+        db.add(entry)
+        record_food_use(db, user_id, entry_data.food_id)
+    else:
+        entry = _owned_entry(db, user_id, op.id)
+        days.add(entry.meal.date)
+        entry.meal_id = meal.id
+        entry.food_id = entry_data.food_id
+        entry.quantity_grams = entry_data.quantity_grams
+        for field, value in nutrition.items():
+            setattr(entry, field, value)
+
+    db.flush()
+    return entry.id
+
+@router.post("/", response_model=SyncBatchResponse)
+def push_changes(
+    batch: SyncBatch,
+    current_user: UserJWT = Depends(get_current_db_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Apply a batch of offline-queued writes in order.
+
+    WHY savepoint per operation: One stale or invalid write is reported back
+    without throwing away the rest of the batch
+    WHY client_id: Lets later operations reference meals created earlier in the batch
+    WHY no token in the response: The server's latest version may include other
+    devices' writes this client hasn't pulled; it keeps its pull token instead
+    """
+    user_id = current_user.user_id
+    client_meals: Dict[str, int] = {}
+    # Days whose totals changed, pushed to open streams once the batch commits
+    days: Set[date] = set()
+    results = []
+
+    for op in batch.operations:
+        try:
+            with db.begin_nested():
+                if op.entity == "meal":
+                    server_id = _apply_meal(db, user_id, op, days)
+                else:
+                    server_id = _apply_food_entry(db, user_id, op, client_meals, days)
+        except HTTPException as e:
+            results.append(SyncOperationResult(status="error", id=op.id, client_id=op.client_id, detail=e.detail))
+            continue
+        except ValidationError as e:
+            results.append(SyncOperationResult(status="error", id=op.id, client_id=op.client_id, detail=str(e)))
+            continue
+        except SQLAlchemyError:
+            # The savepoint is rolled back; report this write without losing the batch
+            results.append(SyncOperationResult(
+                status="error", id=op.id, client_id=op.client_id, detail="Database rejected this operation"
+            ))
+            continue
+
+        if op.op == "create" and op.entity == "meal" and op.client_id is not None:
+            client_meals[op.client_id] = server_id
+        results.append(SyncOperationResult(status="ok", id=server_id, client_id=op.client_id))
+
+    db.commit()
+    invalidate_ranking(user_id)
+    publish_daily_totals(db, user_id, days)
+    return SyncBatchResponse(results=results)
@@ -1,17 +1,27 @@
 from .user import UserCreate, UserRead, UserJWT
 from .login import LoginRequest, LogingResponse
 from .nutrition import (
-    FoodCreate, FoodRead, 
+    FoodCreate, FoodRead, SimilarFood, FoodSuggestion,
     MealCreate, MealRead, MealSummary,
     FoodEntryCreate, FoodEntryRead,
+    FoodEntryExport, DailyTotal, AnalyticsSummaryRead,
     MealType
 )
+from .sync import (
+    SyncMeal, SyncFoodEntry, SyncDeleted, SyncResponse,
+    SyncMealData, SyncFoodEntryData,
+    SyncOperation, SyncBatch, SyncOperationResult, SyncBatchResponse
+)
 
 __all__ = [
     "UserCreate", "UserRead", "UserJWT",
     "LoginRequest", "LogingResponse", 
-    "FoodCreate", "FoodRead",
+    "FoodCreate", "FoodRead", "SimilarFood", "FoodSuggestion",
     "MealCreate", "MealRead", "MealSummary",
     "FoodEntryCreate", "FoodEntryRead",
-    "MealType"
+    "FoodEntryExport", "DailyTotal", "AnalyticsSummaryRead",
+    "MealType",
+    "SyncMeal", "SyncFoodEntry", "SyncDeleted", "SyncResponse",
+    "SyncMealData", "SyncFoodEntryData",
+    "SyncOperation", "SyncBatch", "SyncOperationResult", "SyncBatchResponse"
 ]
\ No newline at end of file
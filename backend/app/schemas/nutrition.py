@@ -1,6 +1,6 @@
 from pydantic import BaseModel, validator
-from typing import List, Optional
-from datetime import date
+from typing import Any, Dict, List, Optional
+from datetime import date, datetime
 from enum import Enum
 
 # Enum for meal types - restricts valid values
@@ -34,6 +34,12 @@ class FoodRead(FoodBase):
     class Config:
         orm_mode = True  
 
+class FoodSuggestion(FoodRead):
+    use_count: int = 0  # Times the current user has logged this food
+
+class SimilarFood(FoodRead):
+    distance: float  # Distance in normalized nutrient space (0 = identical)
+
 class FoodEntryBase(BaseModel):
     food_id: int
     quantity_grams: float
@@ -45,7 +51,7 @@ class FoodEntryBase(BaseModel):
         return value
 
 class FoodEntryCreate(FoodEntryBase):
-    pass
+    meal_id: int
 
 class FoodEntryRead(FoodEntryBase):
     id: int
@@ -82,4 +88,40 @@ class MealSummary(MealBase):
     total_protein: float
     total_carbs: float
     total_fat: float
-    entry_count: int  # How many foods in this meal
\ No newline at end of file
+    entry_count: int  # How many foods in this meal
+
+# Flat entry row used by exports (live and archived entries look the same)
+class FoodEntryExport(BaseModel):
+    entry_id: int
+    meal_id: int
+    date: date
+    meal_type: MealType
+    food_id: int
+    food_name: str
+    quantity_grams: float
+    total_calories: float
+    total_protein: float
+    total_carbs: float
+    total_fat: float
+    archived: bool = False
+
+class DailyTotal(BaseModel):
+    date: date
+    total_calories: float
+    total_protein: float
+    total_carbs: float
+    total_fat: float
+    entry_count: int
+
+
+class AnalyticsSummaryRead(BaseModel):
+    id: int
+    computed_at: datetime
+    workers: int
+    duration_seconds: float
+    user_count: int
+    meal_count: int
+    summary: Dict[str, Any]
+    
+    class Config:
+        orm_mode = True
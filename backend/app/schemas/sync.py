@@ -0,0 +1,69 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List, Literal, Optional
+from datetime import date
+from .nutrition import MealCreate, FoodEntryCreate
+
+# Compact rows: only what a client needs to rebuild its local copy
+class SyncMeal(BaseModel):
+    id: int
+    date: date
+    meal_type: str
+    version: int
+
+    class Config:
+        orm_mode = True
+
+class SyncFoodEntry(BaseModel):
+    id: int
+    meal_id: int
+    food_id: int
+    quantity_grams: float
+    total_calories: float
+    total_protein: float
+    total_carbs: float
+    total_fat: float
+    version: int
+
+    class Config:
+        orm_mode = True
+
+class SyncDeleted(BaseModel):
+    meals: List[int] = []
+    food_entries: List[int] = []
+
+class SyncResponse(BaseModel):
+    token: str  # Pass back as ?since= on the next sync
+    meals: List[SyncMeal] = []
+    food_entries: List[SyncFoodEntry] = []
+    deleted: SyncDeleted = SyncDeleted()
+
+# Typed payloads for create/update, parsed per operation so one bad write fails alone
+class SyncMealData(MealCreate):
+    pass
+
+class SyncFoodEntryData(FoodEntryCreate):
+    meal_id: Optional[int] = None
+    meal_client_id: Optional[str] = None  # A meal created earlier in the same batch
+
+# One offline-queued write
+class SyncOperation(BaseModel):
+    op: Literal["create", "update", "delete"]
+    entity: Literal["meal", "food_entry"]
+    id: Optional[int] = None  # Server ID, for update/delete
+    client_id: Optional[str] = None  # Client's temporary ID, for create
+    # Raw payload; validated as SyncMealData or SyncFoodEntryData when the operation is applied
+    data: Dict[str, Any] = {}
+
+class SyncBatch(BaseModel):
+    operations: List[SyncOperation]
+
+class SyncOperationResult(BaseModel):
+    status: Literal["ok", "error"]
+    id: Optional[int] = None
+    client_id: Optional[str] = None
+    detail: Optional[str] = None
+
+# No token: the client keeps the one from its last pull, which also brings back
+# its own writes, so writes from other devices in between are never skipped
+class SyncBatchResponse(BaseModel):
+    results: List[SyncOperationResult]
@@ -15,7 +15,8 @@ class UserRead(BaseModel):
     class Config:
         orm_mode = True
 
-# Output for Supabase JWT users (no database id)
+# Output for Supabase JWT users (database id is resolved from sub on demand)
 class UserJWT(BaseModel):
     email: EmailStr
-    sub: Optional[str] = None  # Supabase user ID
\ No newline at end of file
+    sub: Optional[str] = None  # Supabase user ID
+    user_id: Optional[int] = None  # Local users.id, set by get_current_db_user
\ No newline at end of file
@@ -0,0 +1,254 @@
+"""
+Population-level nutrition analytics across all users.
+
+Users are split into partitions (user_id % workers) and each partition is
+processed by its own worker process with its own database connection. A
+worker streams its per-meal totals through a server-side cursor, so memory
+holds one batch of rows plus the partition's aggregates, never the whole
+food_entries table. Partial results are merged in the parent and saved as an
+AnalyticsSummary row, served by GET /api/admin/analytics.
+
+WHY partition by user: A user's days never span two workers, so daily intake
+is complete within one partition and partials merge by simple concatenation.
+
+Meal and day statistics include archived history through daily_rollups (one
+row per archived meal). Top foods need per-entry food IDs, which rollups
+don't keep, so they cover live entries only; the summary's "coverage" records
+the date range behind each.
+
+Run it as a job:  python -m app.services.analytics [--workers N] [--top 20]
+"""
+import argparse
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.nutrition import AnalyticsSummary, DailyRollup, Food, FoodEntry, Meal
+
+PERCENTILES = [10, 25, 50, 75, 90]
+STREAM_BATCH_SIZE = 5000
+
+# Energy per gram, for the share of calories coming from each macro
+KCAL_PER_GRAM = {"protein": 4.0, "carbs": 4.0, "fat": 9.0}
+
+def _partition_filter(column, partition: int, partitions: int):
+    return (column % partitions) == partition
+
+def _date_range(dates: List) -> Optional[Dict[str, str]]:
+    dates = [d for d in dates if d is not None]
+    if not dates:
+        return None
+    return {"from": min(dates).isoformat(), "to": max(dates).isoformat()}
+
+def aggregate_partition(database_url: str, partition: int, partitions: int) -> Dict:
+    """
+    Worker: aggregate one user partition.
+
+    Returns mergeable partials: raw per-meal and per-day values (for exact
+    percentiles) and food counters (for top-N).
+    """
+    engine = create_engine(database_url)
+    try:
+        # (user_id, date, meal_type) -> [calories, protein, carbs, fat]; a rollup and a
+        # live meal re-created on the same archived slot merge into one meal
+        meals: Dict[tuple, List[float]] = defaultdict(lambda: [0.0, 0.0, 0.0, 0.0])
+
+        per_meal = select(
+            Meal.user_id,
+            Meal.date,
+            Meal.meal_type,
+            func.sum(FoodEntry.total_calories),
+            func.sum(FoodEntry.total_protein),
+            func.sum(FoodEntry.total_carbs),
+            func.sum(FoodEntry.total_fat)
+        ).join(FoodEntry, FoodEntry.meal_id == Meal.id)\
+            .where(_partition_filter(Meal.user_id, partition, partitions))\
+            .group_by(Meal.id, Meal.user_id, Meal.date, Meal.meal_type)
+
+        # Archived meals: entries are gone, their per-meal totals remain
+        rollups = select(
+            DailyRollup.user_id,
+            DailyRollup.date,
+            DailyRollup.meal_type,
+            DailyRollup.total_calories,
+            DailyRollup.total_protein,
+            DailyRollup.total_carbs,
+            DailyRollup.total_fat
+        ).where(
+            _partition_filter(DailyRollup.user_id, partition, partitions),
+            DailyRollup.entry_count > 0
+        )
+
+        food_counts = select(
+            FoodEntry.food_id,
+            func.count(FoodEntry.id),
+            func.sum(FoodEntry.quantity_grams)
+        ).join(Meal, FoodEntry.meal_id == Meal.id)\
+            .where(_partition_filter(Meal.user_id, partition, partitions))\
+            .group_by(FoodEntry.food_id)
+
+        live_range = select(func.min(Meal.date), func.max(Meal.date))\
+            .join(FoodEntry, FoodEntry.meal_id == Meal.id)\
+            .where(_partition_filter(Meal.user_id, partition, partitions))
+
+        with engine.connect() as conn:
+            for stmt in (per_meal, rollups):
+                # stream_results uses a server-side cursor where the driver supports it
+                result = conn.execution_options(stream_results=True, yield_per=STREAM_BATCH_SIZE).execute(stmt)
+                for user_id, day, meal_type, *totals in result:
+                    meal_sum = meals[(user_id, day, meal_type)]
+                    for i, value in enumerate(totals):
+                        meal_sum[i] += value or 0.0
+
+            entry_counts: Counter = Counter()
+            grams: Counter = Counter()
+            for food_id, count, total_grams in conn.execute(food_counts):
+                entry_counts[food_id] = count
+                grams[food_id] = total_grams or 0.0
+            live_from, live_to = conn.execute(live_range).one()
+
+        meal_calories: Dict[str, List[float]] = defaultdict(list)
+        meal_sums: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0.0, 0.0, 0.0])
+        days: Dict[tuple, List[float]] = defaultdict(lambda: [0.0, 0.0, 0.0, 0.0])
+        users = set()
+        for (user_id, day, meal_type), totals in meals.items():
+            meal_calories[meal_type].append(totals[0])
+            meal_sum, day_sum = meal_sums[meal_type], days[(user_id, day)]
+            for i, value in enumerate(totals):
+                meal_sum[i] += value
+                day_sum[i] += value
+            users.add(user_id)
+
+        day_totals = np.array(list(days.values()), dtype=np.float64).reshape(-1, 4)
+        meal_dates = [day for _, day in days]
+        return {
+            "users": len(users),
+            "meal_calories": {k: np.asarray(v) for k, v in meal_calories.items()},
+            "meal_sums": {k: np.asarray(v) for k, v in meal_sums.items()},
+            "day_totals": day_totals,
+            "entry_counts": entry_counts,
+            "grams": grams,
+            "meal_dates": [min(meal_dates), max(meal_dates)] if meal_dates else [],
+            "live_dates": [live_from, live_to],
+        }
+    finally:
+        engine.dispose()
+
+def _percentiles(values: np.ndarray) -> Dict[str, float]:
+    if not len(values):
+        return {}
+    return {f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+def merge_partials(partials: List[Dict], top_n: int) -> Dict:
+    meal_calories: Dict[str, List[np.ndarray]] = defaultdict(list)
+    meal_sums: Dict[str, np.ndarray] = defaultdict(lambda: np.zeros(4))
+    entry_counts: Counter = Counter()
+    grams: Counter = Counter()
+    day_totals = []
+    meal_dates, live_dates = [], []
+    users = 0
+
+    for part in partials:
+        users += part["users"]
+        for meal_type, values in part["meal_calories"].items():
+            meal_calories[meal_type].append(values)
+        for meal_type, sums in part["meal_sums"].items():
+            meal_sums[meal_type] += sums
+        day_totals.append(part["day_totals"])
+        entry_counts.update(part["entry_counts"])
+        grams.update(part["grams"])
+        meal_dates.extend(part["meal_dates"])
+        live_dates.extend(part["live_dates"])
+
+    by_meal_type = {}
+    for meal_type, arrays in meal_calories.items():
+        values = np.concatenate(arrays)
+        calories, protein, carbs, fat = meal_sums[meal_type] / len(values)
+        by_meal_type[meal_type] = {
+            "meals": int(len(values)),
+            "avg_calories": round(float(calories), 2),
+            "avg_protein": round(float(protein), 2),
+            "avg_carbs": round(float(carbs), 2),
+            "avg_fat": round(float(fat), 2),
+            "calories_percentiles": _percentiles(values),
+        }
+
+    days = np.vstack(day_totals) if day_totals else np.zeros((0, 4))
+    macro_split = {}
+    if len(days):
+        macro_kcal = days[:, 1:] * np.array([KCAL_PER_GRAM["protein"], KCAL_PER_GRAM["carbs"], KCAL_PER_GRAM["fat"]])
+        kcal = macro_kcal.sum(axis=1)
+        shares = macro_kcal[kcal > 0] / kcal[kcal > 0, None] * 100
+        for i, macro in enumerate(["protein", "carbs", "fat"]):
+            macro_split[macro] = _percentiles(shares[:, i]) if len(shares) else {}
+
+    return {
+        "users": users,
+        "meals": sum(stats["meals"] for stats in by_meal_type.values()),
+        "by_meal_type": by_meal_type,
+        "daily_calories_percentiles": _percentiles(days[:, 0]) if len(days) else {},
+        "macro_share_percentiles": macro_split,
+        "top_food_ids": [
+            {"food_id": int(food_id), "entries": int(count), "total_grams": round(float(grams[food_id]), 1)}
+            for food_id, count in entry_counts.most_common(top_n)
+        ],
+        # Dates behind each statistic: meal/day stats include archived rollups, top foods don't
+        "coverage": {
+            "meals": _date_range(meal_dates),
+            "top_foods": _date_range(live_dates),
+        },
+    }
+
+def compute_analytics(database_url: str, workers: int, top_n: int = 20) -> Dict:
+    """Fan partitions out over a process pool and merge the results."""
+    if workers <= 1:
+        partials = [aggregate_partition(database_url, 0, 1)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(aggregate_partition, database_url, k, workers) for k in range(workers)]
+            partials = [future.result() for future in futures]
+    return merge_partials(partials, top_n)
+
+def run_analytics(db: Session, workers: int, top_n: int = 20, database_url: Optional[str] = None) -> AnalyticsSummary:
+    """Compute the aggregates and store them as a new AnalyticsSummary."""
+    start = time.perf_counter()
+    summary = compute_analytics(database_url or settings.DATABASE_URL, workers, top_n)
+
+    # Attach names in the parent: one small lookup instead of one per worker
+    ids = [item["food_id"] for item in summary["top_food_ids"]]
+    names = dict(db.query(Food.id, Food.name).filter(Food.id.in_(ids)).all()) if ids else {}
+    summary["top_foods"] = [{**item, "name": names.get(item["food_id"])} for item in summary.pop("top_food_ids")]
+
+    row = AnalyticsSummary(
+        workers=workers,
+        duration_seconds=round(time.perf_counter() - start, 3),
+        user_count=summary["users"],
+        meal_count=summary["meals"],
+        summary=summary
+    )
+    db.add(row)
+    db.commit()
+    db.refresh(row)
+    return row
+
+if __name__ == "__main__":
+    import os
+    from app.core.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Compute population nutrition analytics")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--top", type=int, default=20, help="Number of top foods to keep")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        row = run_analytics(db, args.workers, args.top)
+        print(f"✅ Analytics for {row.user_count} users / {row.meal_count} meals in {row.duration_seconds}s")
+    finally:
+        db.close()
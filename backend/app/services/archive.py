@@ -0,0 +1,242 @@
+"""
+Cold-history archival of food entries.
+
+Entries whose meal is older than ARCHIVE_HORIZON_DAYS are moved out of the
+food_entries table into Parquet files partitioned by user and month:
+
+    <ARCHIVE_DIR>/user_id=<id>/month=<YYYY-MM>.parquet
+
+Per-meal totals stay online in daily_rollups, so reports never need to open
+the archive. Exports merge archived and live rows.
+
+Archived meals and entries are deleted as the owning user, so the sync
+listener records tombstones and sync clients drop them as well.
+
+Run it as a job:  python -m app.services.archive [--days N]
+"""
+import argparse
+import os
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.nutrition import DailyRollup, Food, FoodEntry, Meal
+
+ARCHIVE_SCHEMA = pa.schema([
+    ("entry_id", pa.int64()),
+    ("meal_id", pa.int64()),
+    ("date", pa.date32()),
+    ("meal_type", pa.string()),
+    ("food_id", pa.int64()),
+    ("food_name", pa.string()),
+    ("quantity_grams", pa.float64()),
+    ("total_calories", pa.float64()),
+    ("total_protein", pa.float64()),
+    ("total_carbs", pa.float64()),
+    ("total_fat", pa.float64()),
+])
+
+def partition_path(user_id: int, month: str, archive_dir: Optional[str] = None) -> str:
+    return os.path.join(archive_dir or settings.ARCHIVE_DIR, f"user_id={user_id}", f"month={month}.parquet")
+
+def _months_between(start: date, end: date) -> List[str]:
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+def _write_partition(path: str, rows: List[dict]) -> None:
+    """
+    Append rows to a partition file.
+
+    WHY dedupe on entry_id: The file is replaced before the database delete is
+    committed, so a crashed run may be retried with rows already on disk.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tables = []
+    if os.path.exists(path):
+        existing = pq.read_table(path, memory_map=True)
+        seen = set(existing.column("entry_id").to_pylist())
+        rows = [row for row in rows if row["entry_id"] not in seen]
+        tables.append(existing)
+    if not rows:
+        return
+    tables.append(pa.Table.from_pylist(rows, schema=ARCHIVE_SCHEMA))
+
+    tmp_path = path + ".tmp"
+    pq.write_table(pa.concat_tables(tables), tmp_path, compression="zstd")
+    os.replace(tmp_path, path)
+
+def _add_to_rollup(db: Session, user_id: int, meal: Meal, entries: List[FoodEntry]) -> None:
+    rollup = db.query(DailyRollup).filter(
+        DailyRollup.user_id == user_id,
+        DailyRollup.date == meal.date,
+        DailyRollup.meal_type == meal.meal_type
+    ).first()
+    if not rollup:
+        rollup = DailyRollup(
+            user_id=user_id, date=meal.date, meal_type=meal.meal_type,
+            total_calories=0.0, total_protein=0.0, total_carbs=0.0, total_fat=0.0,
+            entry_count=0
+        )
+        db.add(rollup)
+
+    rollup.total_calories += sum(e.total_calories for e in entries)
+    rollup.total_protein += sum(e.total_protein for e in entries)
+    rollup.total_carbs += sum(e.total_carbs for e in entries)
+    rollup.total_fat += sum(e.total_fat for e in entries)
+    rollup.entry_count += len(entries)
+
+def archive_user(db: Session, user_id: int, cutoff: date, archive_dir: Optional[str] = None) -> int:
+    """Archive one user's meals dated before cutoff. Returns the number of entries moved."""
+    meals = db.query(Meal).filter(
+        Meal.user_id == user_id,
+        Meal.date < cutoff
+    ).order_by(Meal.date).all()
+    if not meals:
+        return 0
+
+    food_names = dict(
+        db.query(Food.id, Food.name)
+        .join(FoodEntry, FoodEntry.food_id == Food.id)
+        .join(Meal, FoodEntry.meal_id == Meal.id)
+        .filter(Meal.user_id == user_id, Meal.date < cutoff)
+        .distinct()
+        .all()
+    )
+
+    partitions: Dict[str, List[dict]] = defaultdict(list)
+    moved = 0
+    for meal in meals:
+        entries = list(meal.food_entries)
+        for entry in entries:
+            partitions[meal.date.strftime("%Y-%m")].append({
+                "entry_id": entry.id,
+                "meal_id": meal.id,
+                "date": meal.date,
+                "meal_type": meal.meal_type,
+                "food_id": entry.food_id,
+                "food_name": food_names.get(entry.food_id, ""),
+                "quantity_grams": entry.quantity_grams,
+                "total_calories": entry.total_calories,
+                "total_protein": entry.total_protein,
+                "total_carbs": entry.total_carbs,
+                "total_fat": entry.total_fat,
+            })
+        _add_to_rollup(db, user_id, meal, entries)
+        moved += len(entries)
+
+    for month, rows in partitions.items():
+        _write_partition(partition_path(user_id, month, archive_dir), rows)
+
+    # Meals go too: their totals live on in daily_rollups. Deleting as the
+    # user versions the deletes, so synced devices get tombstones for them
+    db.info["user_id"] = user_id
+    try:
+        for meal in meals:
+            db.delete(meal)
+        db.commit()
+    finally:
+        db.info.pop("user_id", None)
+    return moved
+
+def archive_entries(db: Session, horizon_days: Optional[int] = None, archive_dir: Optional[str] = None) -> int:
+    """Archive every user's history older than the horizon. Returns entries moved."""
+    days = horizon_days if horizon_days is not None else settings.ARCHIVE_HORIZON_DAYS
+    cutoff = date.today() - timedelta(days=days)
+
+    user_ids = [
+        user_id for (user_id,) in
+        db.query(Meal.user_id).filter(Meal.date < cutoff).distinct().all()
+    ]
+    return sum(archive_user(db, user_id, cutoff, archive_dir) for user_id in user_ids)
+
+def read_archived_entries(
+    user_id: int,
+    start: date,
+    end: date,
+    archive_dir: Optional[str] = None
+) -> List[dict]:
+    """Read a user's archived entries dated within [start, end], oldest first."""
+    rows = []
+    for month in _months_between(start, end):
+        path = partition_path(user_id, month, archive_dir)
+        if not os.path.exists(path):
+            continue
+        table = pq.read_table(
+            path,
+            memory_map=True,
+            filters=[("date", ">=", start), ("date", "<=", end)]
+        )
+        rows.extend(table.to_pylist())
+    rows.sort(key=lambda row: (row["date"], row["entry_id"]))
+    return rows
+
+def get_daily_totals(db: Session, user_id: int, start: date, end: date) -> List[dict]:
+    """
+    Day totals for a user, merging live entries with archived rollups.
+
+    WHY rollups: Archived days are answered from a small online table
+    instead of opening Parquet files.
+    """
+    totals: Dict[date, dict] = {}
+
+    def add(day, calories, protein, carbs, fat, count):
+        row = totals.setdefault(day, {
+            "date": day, "total_calories": 0.0, "total_protein": 0.0,
+            "total_carbs": 0.0, "total_fat": 0.0, "entry_count": 0
+        })
+        row["total_calories"] += calories or 0.0
+        row["total_protein"] += protein or 0.0
+        row["total_carbs"] += carbs or 0.0
+        row["total_fat"] += fat or 0.0
+        row["entry_count"] += count or 0
+
+    live = db.query(
+        Meal.date,
+        func.sum(FoodEntry.total_calories),
+        func.sum(FoodEntry.total_protein),
+        func.sum(FoodEntry.total_carbs),
+        func.sum(FoodEntry.total_fat),
+        func.count(FoodEntry.id)
+    ).join(FoodEntry, FoodEntry.meal_id == Meal.id)\
+        .filter(Meal.user_id == user_id, Meal.date >= start, Meal.date <= end)\
+        .group_by(Meal.date)
+    for row in live:
+        add(*row)
+
+    archived = db.query(
+        DailyRollup.date,
+        func.sum(DailyRollup.total_calories),
+        func.sum(DailyRollup.total_protein),
+        func.sum(DailyRollup.total_carbs),
+        func.sum(DailyRollup.total_fat),
+        func.sum(DailyRollup.entry_count)
+    ).filter(DailyRollup.user_id == user_id, DailyRollup.date >= start, DailyRollup.date <= end)\
+        .group_by(DailyRollup.date)
+    for row in archived:
+        add(*row)
+
+    return [totals[day] for day in sorted(totals)]
+
+if __name__ == "__main__":
+    from app.core.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Archive old food entries to Parquet")
+    parser.add_argument("--days", type=int, default=None, help="Archive horizon in days")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        moved = archive_entries(db, horizon_days=args.days)
+        print(f"✅ Archived {moved} food entries")
+    finally:
+        db.close()
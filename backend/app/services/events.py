@@ -0,0 +1,176 @@
+"""
+Per-user pub/sub for pushing live updates to connected clients.
+
+Route handlers publish after they commit; each open stream holds an
+asyncio.Queue that the broker fans events into. Idle clients cost a queue
+and a connection, never a database query.
+
+Handlers run in FastAPI's threadpool, so publish() is thread-safe and hands
+events to the event loop with call_soon_threadsafe.
+
+With several workers, set EVENTS_BACKEND_URL to a Redis URL so an edit
+served by one worker reaches streams held by another.
+"""
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from datetime import date
+from typing import AsyncIterator, Dict, Iterable, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services.archive import get_daily_totals
+
+logger = logging.getLogger(__name__)
+
+# Events queued for a slow client beyond this are dropped; it will catch up on the next one
+QUEUE_SIZE = 16
+
+# Backoff between attempts to resubscribe to Redis after the connection drops
+RECONNECT_MIN_SECONDS = 1.0
+RECONNECT_MAX_SECONDS = 30.0
+
+class LocalBackend:
+    """Single-process backend: publishing delivers straight to this worker's subscribers."""
+
+    cross_worker = False
+
+    async def start(self, deliver) -> None:
+        pass
+
+    def publish(self, broker: "EventBroker", user_id: int, event: dict) -> None:
+        broker.deliver_threadsafe(user_id, event)
+
+class RedisBackend:
+    """Cross-worker backend over Redis pub/sub (needs the `redis` package)."""
+
+    cross_worker = True
+    CHANNEL = "trackfood:events"
+
+    def __init__(self, url: str):
+        try:
+            import redis
+            import redis.asyncio as aioredis
+        except ImportError:
+            raise RuntimeError("EVENTS_BACKEND_URL is set but the 'redis' package is not installed")
+        self._publisher = redis.Redis.from_url(url)
+        self._subscriber = aioredis.Redis.from_url(url)
+
+    async def start(self, deliver) -> None:
+        # Keep a reference: the loop only holds tasks weakly
+        self._task = asyncio.get_running_loop().create_task(self._listen(deliver))
+
+    async def _listen(self, deliver) -> None:
+        """
+        Deliver channel messages until cancelled, resubscribing when Redis drops.
+
+        WHY retry here: Every stream on this worker depends on this one task;
+        if it died silently they would all stop receiving events
+        """
+        delay = RECONNECT_MIN_SECONDS
+        while True:
+            pubsub = self._subscriber.pubsub()
+            try:
+                await pubsub.subscribe(self.CHANNEL)
+                delay = RECONNECT_MIN_SECONDS
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        payload = json.loads(message["data"])
+                        deliver(payload["user_id"], payload["event"])
+                    except (ValueError, KeyError):
+                        logger.warning("Ignoring malformed event message")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Event subscription lost, retrying in %.0fs", delay, exc_info=True)
+            finally:
+                try:
+                    await pubsub.reset()
+                except Exception:
+                    pass
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+
+    def publish(self, broker: "EventBroker", user_id: int, event: dict) -> None:
+        self._publisher.publish(self.CHANNEL, json.dumps({"user_id": user_id, "event": event}, default=str))
+
+class EventBroker:
+    def __init__(self, backend):
+        self.backend = backend
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._start_lock = threading.Lock()
+        self._started = False
+
+    async def _ensure_started(self) -> None:
+        # Started lazily from the first stream, so it binds to the server's event loop
+        with self._start_lock:
+            if self._started:
+                return
+            self._started = True
+            self._loop = asyncio.get_running_loop()
+        await self.backend.start(self._deliver)
+
+    def has_listeners(self, user_id: int) -> bool:
+        """False only when we know nobody is listening, so publishers can skip work."""
+        return self.backend.cross_worker or bool(self._subscribers.get(user_id))
+
+    def publish(self, user_id: int, event: dict) -> None:
+        """Send an event to every stream the user has open. Safe to call from any thread."""
+        self.backend.publish(self, user_id, event)
+
+    def deliver_threadsafe(self, user_id: int, event: dict) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._deliver, user_id, event)
+
+    def _deliver(self, user_id: int, event: dict) -> None:
+        for queue in list(self._subscribers.get(user_id, ())):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                pass
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int) -> AsyncIterator[asyncio.Queue]:
+        """Yield a queue that receives the user's events while the context is open."""
+        await self._ensure_started()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._subscribers[user_id].add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers[user_id].discard(queue)
+            if not self._subscribers[user_id]:
+                del self._subscribers[user_id]
+
+broker = EventBroker(
+    RedisBackend(settings.EVENTS_BACKEND_URL) if settings.EVENTS_BACKEND_URL else LocalBackend()
+)
+
+def publish_daily_totals(db: Session, user_id: int, days: Iterable[date]) -> None:
+    """
+    Recalculate and push the totals for each affected day.
+
+    Call after commit. Skipped entirely when the user has no open streams.
+
+    WHY never raise: The write has already committed; a broken or slow events
+    backend must not turn it into an error response
+    """
+    if not broker.has_listeners(user_id):
+        return
+    try:
+        for day in sorted(set(days)):
+            totals = get_daily_totals(db, user_id, day, day)
+            event = totals[0] if totals else {
+                "date": day, "total_calories": 0.0, "total_protein": 0.0,
+                "total_carbs": 0.0, "total_fat": 0.0, "entry_count": 0
+            }
+            broker.publish(user_id, {**event, "date": day.isoformat()})
+    except Exception:
+        logger.warning("Could not publish daily totals for user %s", user_id, exc_info=True)
@@ -0,0 +1,277 @@
+"""
+In-memory nearest-neighbour index over food nutrient vectors.
+
+Each food is a point (calories, protein, carbs, fat, fiber per 100g),
+z-score normalized so no single nutrient dominates the distance. Lookups go
+through a KD-tree, so "foods like X" is answered without scanning the catalog.
+
+WHY a delta buffer: A KD-tree can't be edited in place. Created/updated foods
+go into a small buffer that is brute-force searched alongside the tree, and
+replaced/deleted tree rows are masked out. Once the buffer grows past
+REBUILD_THRESHOLD the tree is rebuilt from memory (no database round trip).
+
+Each worker process holds its own copy, built from the database on first use.
+Foods created on other workers are picked up incrementally: the index keeps
+the highest food ID it has read from the database, and any newer rows are
+fetched into the delta buffer. Updates/deletes made on another worker are
+only seen by the full rebuild every FOOD_INDEX_MAX_AGE_SECONDS.
+
+WHY a brute-force fallback: Under selective constraints most tree neighbours
+get filtered out. Past a small fraction of the catalog, scanning only the
+rows that pass the constraints is cheaper than widening the tree query.
+"""
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.nutrition import Food
+
+NUTRIENTS = ["calories_per_100g", "protein_per_100g", "carbs_per_100g", "fat_per_100g", "fiber_per_100g"]
+# Short names accepted in ?constraints=, e.g. "fat<self,protein>=10"
+NUTRIENT_ALIASES = {name.replace("_per_100g", ""): i for i, name in enumerate(NUTRIENTS)}
+
+REBUILD_THRESHOLD = 1000
+# Stop widening the tree query beyond this fraction of the catalog and brute-force instead
+MAX_TREE_FRACTION = 0.02
+
+_CONSTRAINT_RE = re.compile(r"^\s*(\w+)\s*(<=|>=|<|>)\s*(self|\d+(?:\.\d+)?)\s*$")
+
+Constraint = Tuple[int, str, Optional[float]]
+
+def parse_constraints(text: Optional[str]) -> List[Constraint]:
+    """
+    Parse "fat<self,protein>=10" into (column, operator, value) tuples.
+
+    A value of None means "the source food's own value".
+    """
+    if not text:
+        return []
+    constraints = []
+    for part in text.split(","):
+        match = _CONSTRAINT_RE.match(part)
+        if not match or match.group(1) not in NUTRIENT_ALIASES:
+            raise ValueError(f"Invalid constraint: {part.strip()!r}")
+        nutrient, op, value = match.groups()
+        constraints.append((NUTRIENT_ALIASES[nutrient], op, None if value == "self" else float(value)))
+    return constraints
+
+def _constraint_mask(values: np.ndarray, constraints: List[Constraint], source: np.ndarray) -> np.ndarray:
+    mask = np.ones(len(values), dtype=bool)
+    for column, op, value in constraints:
+        bound = source[column] if value is None else value
+        col = values[:, column]
+        if op == "<":
+            mask &= col < bound
+        elif op == "<=":
+            mask &= col <= bound
+        elif op == ">":
+            mask &= col > bound
+        else:
+            mask &= col >= bound
+    return mask
+
+def food_vector(food: Food) -> np.ndarray:
+    return np.array([getattr(food, name) or 0.0 for name in NUTRIENTS], dtype=np.float64)
+
+class FoodSimilarityIndex:
+    def __init__(self, rebuild_threshold: int = REBUILD_THRESHOLD):
+        self.rebuild_threshold = rebuild_threshold
+        self._lock = threading.RLock()
+        self._built = False
+        self._ids = np.empty(0, dtype=np.int64)
+        self._values = np.empty((0, len(NUTRIENTS)))
+        self._row_of: Dict[int, int] = {}
+        self._tree: Optional[cKDTree] = None
+        self._normalized = np.empty((0, len(NUTRIENTS)))
+        self._built_at = 0.0
+        # Highest food ID read from the database (not from local upserts), so
+        # foods created on other workers below a local create aren't skipped
+        self._max_id = 0
+        self._mean = np.zeros(len(NUTRIENTS))
+        self._scale = np.ones(len(NUTRIENTS))
+        # Tree rows that are stale (food updated or deleted since the build)
+        self._masked: Set[int] = set()
+        # Foods created/updated since the build
+        self._delta: Dict[int, np.ndarray] = {}
+
+    def build(self, ids: np.ndarray, values: np.ndarray) -> None:
+        with self._lock:
+            self._ids = np.asarray(ids, dtype=np.int64)
+            self._values = np.asarray(values, dtype=np.float64).reshape(-1, len(NUTRIENTS))
+            self._row_of = {int(food_id): row for row, food_id in enumerate(self._ids)}
+            if len(self._ids):
+                self._mean = self._values.mean(axis=0)
+                scale = self._values.std(axis=0)
+                self._scale = np.where(scale > 0, scale, 1.0)
+                self._normalized = (self._values - self._mean) / self._scale
+                self._tree = cKDTree(self._normalized)
+            else:
+                self._normalized = np.empty((0, len(NUTRIENTS)))
+                self._tree = None
+            self._masked = set()
+            self._delta = {}
+            self._built = True
+
+    def build_from_db(self, db: Session) -> None:
+        rows = db.query(Food.id, *[getattr(Food, name) for name in NUTRIENTS]).all()
+        ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        values = np.array([[v or 0.0 for v in row[1:]] for row in rows], dtype=np.float64)
+        with self._lock:
+            self.build(ids, values)
+            self._max_id = int(ids.max()) if len(ids) else 0
+            self._built_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Forget the current build; the next ensure_built reloads from the database."""
+        with self._lock:
+            self._built = False
+
+    def _fetch_new_foods(self, db: Session) -> None:
+        """Add foods with IDs above the database watermark to the delta buffer."""
+        rows = db.query(Food.id, *[getattr(Food, name) for name in NUTRIENTS])\
+            .filter(Food.id > self._max_id)\
+            .all()
+        for food_id, *values in rows:
+            row = self._row_of.get(food_id)
+            if row is not None:
+                self._masked.add(row)
+            self._delta[food_id] = np.array([v or 0.0 for v in values], dtype=np.float64)
+            self._max_id = max(self._max_id, food_id)
+        self._maybe_rebuild()
+
+    def ensure_built(self, db: Session) -> None:
+        """Build on first use, pick up foods created elsewhere, and fully rebuild when too old."""
+        expired = time.monotonic() - self._built_at > settings.FOOD_INDEX_MAX_AGE_SECONDS
+        if not self._built or expired:
+            with self._lock:
+                if not self._built or time.monotonic() - self._built_at > settings.FOOD_INDEX_MAX_AGE_SECONDS:
+                    self.build_from_db(db)
+                    return
+
+        # max(id) is answered from the primary key index
+        max_id = db.query(func.max(Food.id)).scalar() or 0
+        if max_id > self._max_id:
+            with self._lock:
+                self._fetch_new_foods(db)
+
+    def _rebuild_from_memory(self) -> None:
+        keep = [row for row in range(len(self._ids)) if row not in self._masked]
+        ids = np.concatenate([self._ids[keep], np.fromiter(self._delta.keys(), dtype=np.int64)])
+        values = np.vstack([self._values[keep]] + [v[None, :] for v in self._delta.values()])
+        self.build(ids, values)
+
+    def _maybe_rebuild(self) -> None:
+        if len(self._delta) + len(self._masked) > self.rebuild_threshold:
+            self._rebuild_from_memory()
+
+    def upsert(self, food: Food) -> None:
+        """Add or replace a food after create_food/update_food commits."""
+        with self._lock:
+            if not self._built:
+                return
+            row = self._row_of.get(food.id)
+            if row is not None:
+                self._masked.add(row)
+            self._delta[food.id] = food_vector(food)
+            self._maybe_rebuild()
+
+    def remove(self, food_id: int) -> None:
+        """Drop a food after delete_food commits."""
+        with self._lock:
+            if not self._built:
+                return
+            row = self._row_of.get(food_id)
+            if row is not None:
+                self._masked.add(row)
+            self._delta.pop(food_id, None)
+            self._maybe_rebuild()
+
+    def vector(self, food_id: int) -> Optional[np.ndarray]:
+        with self._lock:
+            if food_id in self._delta:
+                return self._delta[food_id]
+            row = self._row_of.get(food_id)
+            if row is None or row in self._masked:
+                return None
+            return self._values[row]
+
+    def _tree_search(self, query, source, food_id, limit, constraints) -> Optional[List[Tuple[int, float]]]:
+        """Widen k until enough rows survive; None once k passes MAX_TREE_FRACTION of the catalog."""
+        n = len(self._ids)
+        k_max = max(int(n * MAX_TREE_FRACTION), 4 * (limit + 1))
+        k = min(n, max(4 * (limit + 1), 32))
+        while True:
+            dists, rows = self._tree.query(query, k=k)
+            dists, rows = np.atleast_1d(dists), np.atleast_1d(rows)
+            keep = _constraint_mask(self._values[rows], constraints, source)
+            found = [
+                (int(self._ids[row]), float(dist))
+                for row, dist, ok in zip(rows, dists, keep)
+                if ok and row not in self._masked and self._ids[row] != food_id
+            ]
+            if len(found) >= limit or k >= n:
+                return found[:limit]
+            if k >= k_max:
+                return None
+            k = min(n, k * 4, k_max)
+
+    def _brute_force(self, query, source, food_id, limit, constraints) -> List[Tuple[int, float]]:
+        """Scan only the tree rows that pass the constraints."""
+        keep = _constraint_mask(self._values, constraints, source) & (self._ids != food_id)
+        if self._masked:
+            keep[list(self._masked)] = False
+        rows = np.flatnonzero(keep)
+        if not len(rows):
+            return []
+        dists = np.linalg.norm(self._normalized[rows] - query, axis=1)
+        if len(rows) > limit:
+            nearest = np.argpartition(dists, limit)[:limit]
+            rows, dists = rows[nearest], dists[nearest]
+        return [(int(self._ids[row]), float(dist)) for row, dist in zip(rows, dists)]
+
+    def similar(
+        self,
+        food_id: int,
+        limit: int = 10,
+        constraints: Iterable[Constraint] = (),
+        source: Optional[np.ndarray] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Return up to `limit` (food_id, distance) pairs closest to food_id, nearest first.
+
+        Pass `source` (see food_vector) for a food this index doesn't know yet.
+        """
+        constraints = list(constraints)
+        with self._lock:
+            if source is None:
+                source = self.vector(food_id)
+            if source is None:
+                raise KeyError(food_id)
+            query = (source - self._mean) / self._scale
+            results: List[Tuple[int, float]] = []
+
+            if self._tree is not None:
+                found = self._tree_search(query, source, food_id, limit, constraints)
+                if found is None:
+                    found = self._brute_force(query, source, food_id, limit, constraints)
+                results.extend(found)
+
+            # Brute-force the delta buffer
+            if self._delta:
+                delta_ids = np.fromiter(self._delta.keys(), dtype=np.int64)
+                delta_values = np.vstack(list(self._delta.values()))
+                dists = np.linalg.norm((delta_values - self._mean) / self._scale - query, axis=1)
+                keep = _constraint_mask(delta_values, constraints, source) & (delta_ids != food_id)
+                results.extend((int(i), float(d)) for i, d in zip(delta_ids[keep], dists[keep]))
+
+        results.sort(key=lambda pair: pair[1])
+        return results[:limit]
+
+food_index = FoodSimilarityIndex()
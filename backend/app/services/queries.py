@@ -0,0 +1,112 @@
+"""
+Prebuilt statements for the hot meal/food-entry queries.
+
+Each statement is constructed once at import (or once per filter
+combination) with bind parameters for every per-request value. Requests only
+bind values and execute, so they skip ORM query construction, and
+SQLAlchemy's compiled cache serves the SQL string without recompiling.
+"""
+from datetime import date
+from functools import lru_cache
+from typing import List, Optional
+from sqlalchemy import Integer, bindparam, select
+from sqlalchemy.orm import Session
+from app.models.nutrition import Food, FoodEntry, Meal
+
+_SKIP = bindparam("skip", type_=Integer)
+_LIMIT = bindparam("limit", type_=Integer)
+
+_OWNED_MEAL = select(Meal).where(
+    Meal.id == bindparam("meal_id"),
+    Meal.user_id == bindparam("user_id")
+).limit(1)
+
+_OWNED_ENTRY = select(FoodEntry).join(Meal).where(
+    FoodEntry.id == bindparam("entry_id"),
+    Meal.user_id == bindparam("user_id")
+).limit(1)
+
+_FOOD = select(Food).where(Food.id == bindparam("food_id")).limit(1)
+
+@lru_cache(maxsize=None)
+def _meal_conflict_stmt(exclude: bool):
+    stmt = select(Meal.id).where(
+        Meal.user_id == bindparam("user_id"),
+        Meal.date == bindparam("meal_date"),
+        Meal.meal_type == bindparam("meal_type")
+    )
+    if exclude:
+        stmt = stmt.where(Meal.id != bindparam("exclude_id"))
+    return stmt.limit(1)
+
+@lru_cache(maxsize=None)
+def _meal_list_stmt(by_date: bool, by_type: bool):
+    stmt = select(Meal).where(Meal.user_id == bindparam("user_id"))
+    if by_date:
+        stmt = stmt.where(Meal.date == bindparam("meal_date"))
+    if by_type:
+        stmt = stmt.where(Meal.meal_type == bindparam("meal_type"))
+    return stmt.order_by(Meal.date.desc(), Meal.meal_type).offset(_SKIP).limit(_LIMIT)
+
+@lru_cache(maxsize=None)
+def _entry_list_stmt(by_meal: bool, by_food: bool):
+    stmt = select(FoodEntry).join(Meal).where(Meal.user_id == bindparam("user_id"))
+    if by_meal:
+        stmt = stmt.where(FoodEntry.meal_id == bindparam("meal_id"))
+    if by_food:
+        stmt = stmt.where(FoodEntry.food_id == bindparam("food_id"))
+    return stmt.order_by(Meal.date.desc(), FoodEntry.id.desc()).offset(_SKIP).limit(_LIMIT)
+
+def get_owned_meal(db: Session, user_id: int, meal_id: Optional[int]) -> Optional[Meal]:
+    return db.execute(_OWNED_MEAL, {"meal_id": meal_id, "user_id": user_id}).scalars().first()
+
+def get_owned_entry(db: Session, user_id: int, entry_id: Optional[int]) -> Optional[FoodEntry]:
+    return db.execute(_OWNED_ENTRY, {"entry_id": entry_id, "user_id": user_id}).scalars().first()
+
+def get_food(db: Session, food_id: Optional[int]) -> Optional[Food]:
+    return db.execute(_FOOD, {"food_id": food_id}).scalars().first()
+
+def meal_conflict_exists(
+    db: Session,
+    user_id: int,
+    meal_date: date,
+    meal_type: str,
+    exclude_id: Optional[int] = None
+) -> bool:
+    """True if the user already has a meal of this type on this date (other than exclude_id)."""
+    params = {"user_id": user_id, "meal_date": meal_date, "meal_type": meal_type}
+    if exclude_id is not None:
+        params["exclude_id"] = exclude_id
+    return db.execute(_meal_conflict_stmt(exclude_id is not None), params).first() is not None
+
+def list_meals(
+    db: Session,
+    user_id: int,
+    meal_date: Optional[date],
+    meal_type: Optional[str],
+    skip: int,
+    limit: int
+) -> List[Meal]:
+    params = {"user_id": user_id, "skip": skip, "limit": limit}
+    if meal_date:
+        params["meal_date"] = meal_date
+    if meal_type:
+        params["meal_type"] = meal_type
+    stmt = _meal_list_stmt(bool(meal_date), bool(meal_type))
+    return db.execute(stmt, params).scalars().all()
+
+def list_food_entries(
+    db: Session,
+    user_id: int,
+    meal_id: Optional[int],
+    food_id: Optional[int],
+    skip: int,
+    limit: int
+) -> List[FoodEntry]:
+    params = {"user_id": user_id, "skip": skip, "limit": limit}
+    if meal_id:
+        params["meal_id"] = meal_id
+    if food_id:
+        params["food_id"] = food_id
+    stmt = _entry_list_stmt(bool(meal_id), bool(food_id))
+    return db.execute(stmt, params).scalars().all()
@@ -0,0 +1,115 @@
+"""
+Personalized food autocomplete.
+
+Each user's most-logged foods (food_usage) are ranked by use count decayed by
+recency and cached in memory. A suggestion request filters that cached list
+in Python and runs one indexed prefix query over the catalog to fill the
+remaining slots, so typing never scans the foods table.
+
+The cache is per process. A write invalidates only the worker that served
+it, so other workers can return rankings (including renamed or deleted
+foods) up to SUGGEST_CACHE_TTL_SECONDS old.
+"""
+import math
+from datetime import datetime
+from typing import Dict, List
+
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.models.nutrition import Food, FoodUsage
+
+FOOD_FIELDS = ["id", "name", "calories_per_100g", "protein_per_100g", "carbs_per_100g", "fat_per_100g", "fiber_per_100g"]
+
+# A food's weight halves for every this many days since it was last logged
+HALF_LIFE_DAYS = 30.0
+
+# user_id -> ranked list of suggestion dicts, best first
+ranking_cache = LRUCache(settings.SUGGEST_CACHE_SIZE, ttl_seconds=settings.SUGGEST_CACHE_TTL_SECONDS)
+
+_UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+def record_food_use(db: Session, user_id: int, food_id: int) -> None:
+    """
+    Count one use of a food. Call before the entry's commit; invalidate after it.
+
+    WHY an upsert: Two concurrent first uses of a food would otherwise both
+    insert and one would fail on the primary key
+    """
+    now = datetime.utcnow()
+    insert = _UPSERT_DIALECTS[db.get_bind().dialect.name]
+    stmt = insert(FoodUsage).values(user_id=user_id, food_id=food_id, use_count=1, last_used_at=now)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[FoodUsage.user_id, FoodUsage.food_id],
+        set_={"use_count": FoodUsage.use_count + 1, "last_used_at": now}
+    ))
+
+def invalidate_ranking(user_id: int) -> None:
+    ranking_cache.pop(user_id)
+
+def _score(use_count: int, last_used_at: datetime, now: datetime) -> float:
+    age_days = max((now - last_used_at).total_seconds(), 0.0) / 86400
+    return use_count * math.pow(0.5, age_days / HALF_LIFE_DAYS)
+
+def get_ranking(db: Session, user_id: int) -> List[Dict]:
+    ranking = ranking_cache.get(user_id)
+    if ranking is not None:
+        return ranking
+
+    rows = db.query(Food, FoodUsage.use_count, FoodUsage.last_used_at)\
+        .join(FoodUsage, FoodUsage.food_id == Food.id)\
+        .filter(FoodUsage.user_id == user_id)\
+        .order_by(FoodUsage.use_count.desc())\
+        .limit(settings.SUGGEST_TOP_FOODS)\
+        .all()
+
+    now = datetime.utcnow()
+    ranking = sorted(
+        (
+            {
+                **{field: getattr(food, field) for field in FOOD_FIELDS},
+                "use_count": use_count,
+                "_score": _score(use_count, last_used_at, now),
+                "_words": food.name.lower().split(),
+            }
+            for food, use_count, last_used_at in rows
+        ),
+        key=lambda item: item["_score"],
+        reverse=True
+    )
+    ranking_cache.set(user_id, ranking)
+    return ranking
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def suggest_foods(db: Session, user_id: int, q: str, limit: int) -> List[Dict]:
+    """
+    The user's own matching foods first (best ranked), then catalog prefix matches.
+
+    WHY word prefixes for the user's foods: Typing "chi" should find
+    "Grilled chicken" if that's what they log every day.
+    """
+    text = q.strip().lower()
+    results = [
+        item for item in get_ranking(db, user_id)
+        if not text or any(word.startswith(text) for word in item["_words"])
+    ][:limit]
+
+    if text and len(results) < limit:
+        seen = {item["id"] for item in results}
+        catalog = db.query(Food)\
+            .filter(func.lower(Food.name).like(_escape_like(text) + "%", escape="\\"))\
+            .order_by(func.lower(Food.name))\
+            .limit(limit + len(seen))\
+            .all()
+        for food in catalog:
+            if len(results) >= limit:
+                break
+            if food.id not in seen:
+                results.append({**{field: getattr(food, field) for field in FOOD_FIELDS}, "use_count": 0})
+
+    return [{k: v for k, v in item.items() if not k.startswith("_")} for item in results]
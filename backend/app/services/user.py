@@ -1,6 +1,11 @@
+import uuid
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.schemas.user import UserCreate
 from app.models.user import User
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.database import use_primary
 from app.core.security import hash_password
 from fastapi import HTTPException
 
@@ -14,3 +19,48 @@ def create_user(db: Session, user_in: UserCreate) -> User:
     db.commit()
     db.refresh(db_user)
     return db_user
+
+# Supabase sub -> local users.id. The mapping never changes once created, so
+# after the first request a user's id is resolved without touching the database.
+user_id_cache = LRUCache(settings.USER_ID_CACHE_SIZE)
+
+def get_or_create_user_id(db: Session, sub: str, email: str) -> int:
+    """
+    Map a Supabase JWT sub to a local users.id, creating the row on first sight.
+
+    WHY link by email: Users registered through /users/register get their
+    Supabase ID attached instead of a duplicate row.
+    """
+    try:
+        supabase_id = uuid.UUID(sub)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=401, detail="Invalid subject claim in token")
+
+    cached = user_id_cache.get(supabase_id)
+    if cached is not None:
+        return cached
+
+    # WHY primary: A replica may not have the row yet if it was just created
+    with use_primary(db):
+        user = db.query(User).filter(User.supabase_id == supabase_id).first()
+        if not user:
+            user = db.query(User).filter(User.email == email).first()
+            if user and user.supabase_id is None:
+                user.supabase_id = supabase_id
+            elif user:
+                raise HTTPException(status_code=409, detail="Email is linked to another account")
+            else:
+                user = User(email=email, supabase_id=supabase_id)
+                db.add(user)
+            try:
+                db.commit()
+            except IntegrityError:
+                # A concurrent request inserted the same user first
+                db.rollback()
+                user = db.query(User).filter(User.supabase_id == supabase_id).first()
+                if not user:
+                    raise HTTPException(status_code=409, detail="Could not register user")
+        user_id = user.id
+
+    user_id_cache.set(supabase_id, user_id)
+    return user_id
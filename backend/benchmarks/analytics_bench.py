@@ -0,0 +1,83 @@
+"""
+Scaling of the population analytics job across worker counts.
+
+Seeds a file-backed SQLite database (worker processes need a shared one) and
+times compute_analytics for each worker count. Point --database-url at a
+seeded Postgres copy for numbers that include server-side cursors.
+
+Usage (from backend/):  python -m benchmarks.analytics_bench [--users 2000] [--workers 1,2,4,8]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SUPABASE_JWT_SECRET", "benchmark")
+
+from sqlalchemy import create_engine, insert
+
+from app.core.database import Base
+from app.models import User, Food, Meal, FoodEntry
+from app.services.analytics import compute_analytics
+
+MEAL_TYPES = ["breakfast", "lunch", "dinner", "snack"]
+
+def seed(url: str, users: int, days: int) -> None:
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    today = date.today()
+    with engine.begin() as conn:
+        conn.execute(insert(Food), [
+            {"id": i, "name": f"food {i}", "calories_per_100g": 100, "protein_per_100g": 10,
+             "carbs_per_100g": 10, "fat_per_100g": 5}
+            for i in range(1, 501)
+        ])
+        conn.execute(insert(User), [{"id": u, "email": f"user{u}@example.com"} for u in range(1, users + 1)])
+
+        meals, entries = [], []
+        meal_id = 0
+        for user_id in range(1, users + 1):
+            for d in range(days):
+                for meal_type in MEAL_TYPES:
+                    meal_id += 1
+                    meals.append({"id": meal_id, "user_id": user_id, "date": today - timedelta(days=d),
+                                  "meal_type": meal_type, "version": 0})
+                    for _ in range(3):
+                        grams = random.uniform(50, 300)
+                        entries.append({"meal_id": meal_id, "food_id": random.randint(1, 500),
+                                        "quantity_grams": grams, "total_calories": grams * 2,
+                                        "total_protein": grams * 0.1, "total_carbs": grams * 0.2,
+                                        "total_fat": grams * 0.05, "version": 0})
+        conn.execute(insert(Meal), meals)
+        conn.execute(insert(FoodEntry), entries)
+    engine.dispose()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--database-url", default=None, help="Use an existing seeded database")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url
+        if not url:
+            url = f"sqlite:///{os.path.join(tmp, 'analytics.sqlite3')}"
+            start = time.perf_counter()
+            seed(url, args.users, args.days)
+            print(f"Seeded {args.users} users x {args.days} days in {time.perf_counter() - start:.1f}s")
+
+        baseline = None
+        for workers in [int(w) for w in args.workers.split(",")]:
+            start = time.perf_counter()
+            summary = compute_analytics(url, workers)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{workers:>3} workers: {elapsed:7.2f}s  speedup {baseline / elapsed:4.2f}x  ({summary['meals']} meals)")
+
+if __name__ == "__main__":
+    main()
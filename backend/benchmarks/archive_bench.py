@@ -0,0 +1,102 @@
+"""
+Hot-table size and query latency before/after archiving old food entries.
+
+Usage (from backend/):  python -m benchmarks.archive_bench [--users 50] [--days 730]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SUPABASE_JWT_SECRET", "benchmark")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import User, Food, Meal, FoodEntry
+from app.services.archive import archive_entries, get_daily_totals
+
+MEAL_TYPES = ["breakfast", "lunch", "dinner", "snack"]
+
+def seed(db, users: int, days: int) -> None:
+    foods = [
+        Food(name=f"food {i}", calories_per_100g=random.uniform(20, 600),
+             protein_per_100g=random.uniform(0, 30), carbs_per_100g=random.uniform(0, 80),
+             fat_per_100g=random.uniform(0, 40))
+        for i in range(200)
+    ]
+    db.add_all(foods)
+    db.flush()
+
+    today = date.today()
+    for u in range(users):
+        user = User(email=f"user{u}@example.com")
+        db.add(user)
+        db.flush()
+        for d in range(days):
+            for meal_type in MEAL_TYPES:
+                meal = Meal(user_id=user.id, date=today - timedelta(days=d), meal_type=meal_type)
+                for food in random.sample(foods, 3):
+                    grams = random.uniform(50, 300)
+                    meal.food_entries.append(FoodEntry(
+                        food_id=food.id, quantity_grams=grams,
+                        total_calories=food.calories_per_100g * grams / 100,
+                        total_protein=food.protein_per_100g * grams / 100,
+                        total_carbs=food.carbs_per_100g * grams / 100,
+                        total_fat=food.fat_per_100g * grams / 100,
+                    ))
+                db.add(meal)
+    db.commit()
+
+def measure(db, users: int, repeat: int = 20) -> dict:
+    """Time the get_food_entries ownership query and a 30-day report."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for user_id in range(1, users + 1):
+            db.query(FoodEntry).join(Meal).filter(Meal.user_id == user_id)\
+                .order_by(Meal.date.desc(), FoodEntry.id.desc()).limit(100).all()
+    list_ms = (time.perf_counter() - start) * 1000 / (repeat * users)
+
+    today = date.today()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for user_id in range(1, users + 1):
+            get_daily_totals(db, user_id, today - timedelta(days=30), today)
+    report_ms = (time.perf_counter() - start) * 1000 / (repeat * users)
+
+    return {
+        "food_entries rows": db.query(FoodEntry).count(),
+        "list query ms": round(list_ms, 3),
+        "30-day report ms": round(report_ms, 3),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--horizon", type=int, default=90)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.sqlite3')}")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+
+        seed(db, args.users, args.days)
+        before = measure(db, args.users)
+
+        start = time.perf_counter()
+        moved = archive_entries(db, horizon_days=args.horizon, archive_dir=os.path.join(tmp, "archive"))
+        archive_s = time.perf_counter() - start
+        after = measure(db, args.users)
+
+        print(f"Archived {moved} entries in {archive_s:.1f}s")
+        for key in before:
+            print(f"{key:>20}: {before[key]:>12} -> {after[key]}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Per-request logging overhead on the auth path: the old eager f-string lines
+on a synchronous handler vs. lazy %-style lines through the queue handler.
+
+Usage (from backend/):  python -m benchmarks.auth_logging_bench [--requests 100000]
+"""
+import argparse
+import logging
+import logging.handlers
+import os
+import queue
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SUPABASE_JWT_SECRET", "benchmark")
+
+from app.core.logging_config import JSONFormatter, RouteContextFilter, SamplingFilter
+
+HEADER = {"alg": "ES256", "kid": "3f2a9c4e-0000-4000-8000-000000000000"}
+TOKEN = "x" * 900
+EMAIL = "someone@example.com"
+
+def old_request(logger: logging.Logger) -> None:
+    # The six lines get_current_user used to emit per request
+    logger.info(f"Auth header present: {bool(TOKEN)}")
+    logger.info(f"Token length: {len(TOKEN)}")
+    logger.info(f"Token algorithm: {HEADER.get('alg')}")
+    logger.info(f"Token key ID: {HEADER.get('kid')}")
+    logger.info(f"Token decoded successfully")
+    logger.info(f"User authenticated: {EMAIL}")
+
+def new_request(logger: logging.Logger) -> None:
+    logger.debug("Token algorithm: %s, key ID: %s", HEADER.get('alg'), HEADER.get('kid'))
+    logger.debug("User authenticated: %s", EMAIL)
+
+def make_logger(name: str, handler: logging.Handler, level: int) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(level)
+    return logger
+
+def timed(fn, logger, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        fn(logger)
+    return (time.perf_counter() - start) * 1e6 / requests
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=100_000)
+    args = parser.parse_args()
+
+    devnull = open(os.devnull, "w")
+    sync_handler = logging.StreamHandler(devnull)
+    sync_handler.setFormatter(logging.Formatter("%(levelname)s:%(name)s:%(message)s"))
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(JSONFormatter())
+    queue_handler.addFilter(RouteContextFilter())
+    queue_handler.addFilter(SamplingFilter(0.1, {}))
+    output = logging.StreamHandler(devnull)
+    output.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, output)
+    listener.start()
+
+    cases = [
+        ("old, WARNING level (dropped)", old_request, make_logger("old.warn", sync_handler, logging.WARNING)),
+        ("new, WARNING level (dropped)", new_request, make_logger("new.warn", queue_handler, logging.WARNING)),
+        ("old, INFO level (sync write)", old_request, make_logger("old.info", sync_handler, logging.INFO)),
+        ("new, DEBUG level (queued, 10% sampled)", new_request, make_logger("new.debug", queue_handler, logging.DEBUG)),
+    ]
+    for label, fn, logger in cases:
+        print(f"{label:>40}: {timed(fn, logger, args.requests):7.2f} us/request")
+
+    listener.stop()
+    devnull.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Per-request ORM overhead: the old db.query(...) chains vs. the prebuilt
+statements in app.services.queries, with a cProfile summary of each.
+
+Usage (from backend/):  python -m benchmarks.orm_query_bench [--requests 5000] [--profile]
+"""
+import argparse
+import cProfile
+import os
+import pstats
+import random
+import time
+from datetime import date, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SUPABASE_JWT_SECRET", "benchmark")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import User, Food, Meal, FoodEntry
+from app.services import queries
+
+USERS = 20
+
+def seed(db) -> None:
+    foods = [Food(name=f"food {i}", calories_per_100g=100, protein_per_100g=10,
+                  carbs_per_100g=10, fat_per_100g=5) for i in range(50)]
+    db.add_all(foods)
+    db.add_all(User(email=f"user{u}@example.com") for u in range(USERS))
+    db.flush()
+    today = date.today()
+    for user_id in range(1, USERS + 1):
+        for d in range(60):
+            for meal_type in ["breakfast", "lunch", "dinner"]:
+                meal = Meal(user_id=user_id, date=today - timedelta(days=d), meal_type=meal_type)
+                meal.food_entries = [
+                    FoodEntry(food_id=random.randint(1, 50), quantity_grams=100, total_calories=100,
+                              total_protein=10, total_carbs=10, total_fat=5)
+                    for _ in range(2)
+                ]
+                db.add(meal)
+    db.commit()
+
+def legacy_request(db, user_id: int) -> None:
+    # What get_meals + get_food_entries + get_meal used to build per request
+    db.query(Meal).filter(Meal.user_id == user_id)\
+        .order_by(Meal.date.desc(), Meal.meal_type).offset(0).limit(20).all()
+    db.query(FoodEntry).join(Meal).filter(Meal.user_id == user_id)\
+        .order_by(Meal.date.desc(), FoodEntry.id.desc()).offset(0).limit(20).all()
+    db.query(Meal).filter(Meal.id == user_id * 3, Meal.user_id == user_id).first()
+
+def cached_request(db, user_id: int) -> None:
+    queries.list_meals(db, user_id, None, None, 0, 20)
+    queries.list_food_entries(db, user_id, None, None, 0, 20)
+    queries.get_owned_meal(db, user_id, user_id * 3)
+
+def run(fn, db, requests: int, profile: bool) -> float:
+    profiler = cProfile.Profile() if profile else None
+    start = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    for i in range(requests):
+        fn(db, i % USERS + 1)
+        db.expunge_all()
+    if profiler:
+        profiler.disable()
+    elapsed = (time.perf_counter() - start) * 1e6 / requests
+    if profiler:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--profile", action="store_true", help="Print cProfile stats for each variant")
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    seed(db)
+
+    # Warm SQLAlchemy's compiled cache for both variants
+    run(legacy_request, db, 100, False)
+    run(cached_request, db, 100, False)
+
+    legacy = run(legacy_request, db, args.requests, args.profile)
+    cached = run(cached_request, db, args.requests, args.profile)
+    print(f"db.query chains:      {legacy:8.1f} us/request")
+    print(f"prebuilt statements:  {cached:8.1f} us/request")
+
+if __name__ == "__main__":
+    main()
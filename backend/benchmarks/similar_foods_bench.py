@@ -0,0 +1,62 @@
+"""
+KD-tree similar-food lookups vs. brute force over a synthetic catalog.
+
+Usage (from backend/):  python -m benchmarks.similar_foods_bench [--foods 500000]
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SUPABASE_JWT_SECRET", "benchmark")
+
+import numpy as np
+
+from app.services.food_index import FoodSimilarityIndex, parse_constraints, _constraint_mask
+
+def brute_force(index: FoodSimilarityIndex, food_id: int, limit: int, constraints) -> list:
+    source = index.vector(food_id)
+    normalized = (index._values - index._mean) / index._scale
+    dists = np.linalg.norm(normalized - (source - index._mean) / index._scale, axis=1)
+    keep = _constraint_mask(index._values, constraints, source) & (index._ids != food_id)
+    candidates = np.flatnonzero(keep)
+    order = candidates[np.argsort(dists[candidates])[:limit]]
+    return [(int(index._ids[row]), float(dists[row])) for row in order]
+
+def timed(fn, queries) -> float:
+    start = time.perf_counter()
+    for food_id in queries:
+        fn(food_id)
+    return (time.perf_counter() - start) * 1000 / len(queries)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--foods", type=int, default=500_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    ids = np.arange(1, args.foods + 1)
+    values = np.column_stack([
+        rng.uniform(0, 900, args.foods),   # calories
+        rng.gamma(2.0, 5.0, args.foods),   # protein
+        rng.uniform(0, 100, args.foods),   # carbs
+        rng.gamma(1.5, 8.0, args.foods),   # fat
+        rng.gamma(1.0, 3.0, args.foods),   # fiber
+    ])
+
+    index = FoodSimilarityIndex()
+    start = time.perf_counter()
+    index.build(ids, values)
+    print(f"Built index over {args.foods} foods in {time.perf_counter() - start:.2f}s")
+
+    queries = rng.choice(ids, size=args.queries, replace=False)
+    for label, text in [("no constraints", None), ("fat<self", "fat<self"), ("fat<self,protein>=20", "fat<self,protein>=20")]:
+        constraints = parse_constraints(text)
+        tree_ms = timed(lambda f: index.similar(int(f), args.limit, constraints), queries)
+        brute_ms = timed(lambda f: brute_force(index, int(f), args.limit, constraints), queries)
+        print(f"{label:>22}: kd-tree {tree_ms:7.3f} ms   brute force {brute_ms:8.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,30 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.logging_config import setup_logging, current_route
 from app.routers import user, ping
 from app.routers.foods import router as foods_router
 from app.core.database import create_tables
 from app.routers.meals import router as meals_router
 from app.routers.foodentries import router as food_entries_router
+from app.routers.reports import router as reports_router
+from app.routers.sync import router as sync_router
+from app.routers.stream import router as stream_router
+from app.routers.admin import router as admin_router
+
+setup_logging()
 
 app = FastAPI()
 
+@app.middleware("http")
+async def log_route_context(request: Request, call_next):
+    # Lets log sampling and records know which route they came from
+    token = current_route.set(request.url.path)
+    try:
+        return await call_next(request)
+    finally:
+        current_route.reset(token)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173"], 
@@ -23,6 +39,10 @@ app.include_router(ping.router, prefix="/api")
 app.include_router(foods_router, prefix="/api")
 app.include_router(meals_router, prefix="/api")
 app.include_router(food_entries_router, prefix="/api")
+app.include_router(reports_router, prefix="/api")
+app.include_router(sync_router, prefix="/api")
+app.include_router(stream_router, prefix="/api")
+app.include_router(admin_router, prefix="/api")
 
 create_tables()  
 
@@ -0,0 +1,30 @@
+import os
+import tempfile
+import uuid
+
+# Always a throwaway database: never the DATABASE_URL of the developer's shell
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ["SUPABASE_JWT_SECRET"] = "test-secret"
+
+import pytest
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from main import app
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+@pytest.fixture
+def auth_headers():
+    """Build headers for a fresh user, signed like a legacy HS256 Supabase token."""
+    def make(email=None):
+        sub = str(uuid.uuid4())
+        token = jwt.encode(
+            {"sub": sub, "email": email or f"{sub[:8]}@example.com", "aud": "authenticated"},
+            os.environ["SUPABASE_JWT_SECRET"],
+            algorithm="HS256"
+        )
+        return {"Authorization": f"Bearer {token}"}
+    return make
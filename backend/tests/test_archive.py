@@ -0,0 +1,67 @@
+import datetime as dt
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.user import User
+from app.services.archive import _write_partition, archive_user, partition_path
+
+OLD_DAY = "2020-01-15"
+
+@pytest.fixture
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_DIR", str(tmp_path))
+    return str(tmp_path)
+
+def _log_old_entry(client, headers):
+    food = client.post("/api/foods/", json={
+        "name": f"Rice {uuid.uuid4().hex[:6]}", "calories_per_100g": 130, "protein_per_100g": 3,
+        "carbs_per_100g": 28, "fat_per_100g": 0, "fiber_per_100g": 0
+    }).json()["id"]
+    meal = client.post("/api/meals/", json={"date": OLD_DAY, "meal_type": "dinner"}, headers=headers).json()
+    entry = client.post("/api/food-entries/", json={
+        "meal_id": meal["id"], "food_id": food, "quantity_grams": 100
+    }, headers=headers).json()
+    return meal["id"], entry["id"]
+
+def _user_id(email):
+    db = SessionLocal()
+    try:
+        return db.query(User.id).filter(User.email == email).scalar()
+    finally:
+        db.close()
+
+def _export(client, headers):
+    response = client.get("/api/reports/export", params={"start": OLD_DAY, "end": OLD_DAY}, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+def test_export_prefers_live_row_after_interrupted_archive(client, auth_headers, archive_dir):
+    email = f"{uuid.uuid4().hex[:8]}@example.com"
+    headers = auth_headers(email)
+    meal_id, entry_id = _log_old_entry(client, headers)
+    live = _export(client, headers)[0]
+
+    # The Parquet write happened, the database delete did not
+    row = {key: live[key] for key in live if key != "archived"}
+    row["date"] = dt.date.fromisoformat(row["date"])
+    _write_partition(partition_path(_user_id(email), OLD_DAY[:7], archive_dir), [row])
+
+    exported = _export(client, headers)
+    assert [(row["entry_id"], row["archived"]) for row in exported] == [(entry_id, False)]
+
+def test_archiving_leaves_tombstones_for_sync(client, auth_headers, archive_dir):
+    email = f"{uuid.uuid4().hex[:8]}@example.com"
+    headers = auth_headers(email)
+    meal_id, entry_id = _log_old_entry(client, headers)
+    token = client.get("/api/sync/", headers=headers).json()["token"]
+
+    db = SessionLocal()
+    assert archive_user(db, _user_id(email), dt.date(2021, 1, 1), archive_dir) == 1
+    db.close()
+
+    changes = client.get("/api/sync/", params={"since": token}, headers=headers).json()
+    assert changes["deleted"] == {"meals": [meal_id], "food_entries": [entry_id]}
+    assert [(row["entry_id"], row["archived"]) for row in _export(client, headers)] == [(entry_id, True)]
@@ -0,0 +1,65 @@
+import asyncio
+import json
+import uuid
+
+from app.services import events
+
+def test_creating_an_entry_publishes_daily_totals(client, auth_headers, monkeypatch):
+    published = []
+    monkeypatch.setattr(events.broker, "has_listeners", lambda user_id: True)
+    monkeypatch.setattr(events.broker, "publish", lambda user_id, event: published.append(event))
+    headers = auth_headers()
+    food = client.post("/api/foods/", json={
+        "name": f"Egg {uuid.uuid4().hex[:6]}", "calories_per_100g": 155, "protein_per_100g": 13,
+        "carbs_per_100g": 1, "fat_per_100g": 11, "fiber_per_100g": 0
+    }).json()["id"]
+    meal = client.post("/api/meals/", json={"date": "2026-06-01", "meal_type": "breakfast"}, headers=headers).json()
+
+    response = client.post("/api/food-entries/", json={
+        "meal_id": meal["id"], "food_id": food, "quantity_grams": 200
+    }, headers=headers)
+
+    assert response.status_code == 201
+    assert published[-1]["date"] == "2026-06-01"
+    assert published[-1]["total_calories"] == 310
+    assert published[-1]["entry_count"] == 1
+
+class _FlakyPubSub:
+    """First connection fails; the second delivers one message."""
+
+    attempts = 0
+
+    async def subscribe(self, channel):
+        _FlakyPubSub.attempts += 1
+        if _FlakyPubSub.attempts == 1:
+            raise ConnectionError("redis down")
+
+    async def listen(self):
+        yield {"type": "subscribe"}
+        yield {"type": "message", "data": json.dumps({"user_id": 7, "event": {"date": "2026-06-02"}})}
+        await asyncio.Event().wait()
+
+    async def reset(self):
+        pass
+
+class _FakeRedis:
+    def pubsub(self):
+        return _FlakyPubSub()
+
+def test_redis_listener_resubscribes_after_connection_loss(monkeypatch):
+    monkeypatch.setattr(events, "RECONNECT_MIN_SECONDS", 0.0)
+    backend = object.__new__(events.RedisBackend)
+    backend._subscriber = _FakeRedis()
+    delivered = []
+
+    async def run():
+        await backend.start(lambda user_id, event: delivered.append((user_id, event)))
+        for _ in range(100):
+            if delivered:
+                break
+            await asyncio.sleep(0.01)
+        backend._task.cancel()
+
+    asyncio.run(run())
+    assert delivered == [(7, {"date": "2026-06-02"})]
+    assert _FlakyPubSub.attempts == 2
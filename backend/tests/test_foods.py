@@ -0,0 +1,53 @@
+import uuid
+
+from app.core.database import SessionLocal
+from app.models.nutrition import Food
+from app.services.food_index import food_index
+
+def _create_food(client, name, calories, protein, carbs, fat):
+    response = client.post("/api/foods/", json={
+        "name": f"{name} {uuid.uuid4().hex[:6]}",
+        "calories_per_100g": calories,
+        "protein_per_100g": protein,
+        "carbs_per_100g": carbs,
+        "fat_per_100g": fat,
+        "fiber_per_100g": 0
+    })
+    assert response.status_code == 201
+    return response.json()["id"]
+
+def test_similar_foods_returns_matches_with_distance(client):
+    chicken = _create_food(client, "Chicken breast", 165, 31, 0, 3.6)
+    turkey = _create_food(client, "Turkey breast", 135, 30, 0, 1)
+    _create_food(client, "White rice", 130, 2.7, 28, 0.3)
+    food_index.invalidate()
+
+    response = client.get(f"/api/foods/{chicken}/similar", params={"limit": 1})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["id"] for item in body] == [turkey]
+    assert body[0]["name"].startswith("Turkey breast")
+    assert body[0]["distance"] >= 0
+
+def test_similar_foods_sees_foods_created_on_other_workers(client):
+    source = _create_food(client, "Salmon", 208, 20, 0, 13)
+    food_index.ensure_built(SessionLocal())
+
+    # Another worker creates a near-identical food, then this worker creates one more
+    db = SessionLocal()
+    foreign = Food(name=f"Trout {uuid.uuid4().hex[:6]}", calories_per_100g=208, protein_per_100g=20,
+                   carbs_per_100g=0, fat_per_100g=13, fiber_per_100g=0)
+    db.add(foreign)
+    db.commit()
+    _create_food(client, "Sugar", 387, 0, 100, 0)
+
+    response = client.get(f"/api/foods/{source}/similar", params={"limit": 1})
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == [foreign.id]
+    db.close()
+
+def test_similar_foods_unknown_food_is_404(client):
+    response = client.get("/api/foods/999999/similar")
+    assert response.status_code == 404
@@ -0,0 +1,17 @@
+import logging
+
+from app.core.logging_config import RateLimitFilter
+
+def _record(msg):
+    return logging.LogRecord("app", logging.WARNING, __file__, 1, msg, None, None)
+
+def test_rate_limit_suppresses_repeats_of_a_template():
+    rate_limit = RateLimitFilter(limit=2, window=60.0)
+    kept = [rate_limit.filter(_record("JWKS fetch failed: %s")) for _ in range(5)]
+    assert kept == [True, True, False, False, False]
+
+def test_rate_limit_tracks_a_bounded_number_of_templates():
+    rate_limit = RateLimitFilter(limit=1, window=60.0, max_keys=100)
+    for i in range(1000):
+        assert rate_limit.filter(_record(f"request {i} failed"))
+    assert len(rate_limit._counts) <= 100
@@ -0,0 +1,60 @@
+import tempfile
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core import database
+from app.core.database import Base, ReplicaRouter
+from app.models.nutrition import Food
+
+def _replica(name):
+    """A SQLite stand-in for a replica, holding one food that names it."""
+    engine = create_engine(f"sqlite:///{tempfile.mkdtemp()}/{name}.db")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(Food(name=f"from {name}", calories_per_100g=1, protein_per_100g=1,
+                    carbs_per_100g=1, fat_per_100g=1, fiber_per_100g=0))
+        db.commit()
+    return engine
+
+def _served_by(client):
+    names = {food["name"] for food in client.get("/api/foods/", params={"search": "from "}).json()}
+    return names
+
+@pytest.fixture
+def replicas(monkeypatch):
+    def install(*engines):
+        router = ReplicaRouter(list(engines), retry_seconds=30.0)
+        monkeypatch.setattr(database, "replica_router", router)
+        return router
+    return install
+
+def test_reads_rotate_across_replicas(client, replicas):
+    replicas(_replica("a"), _replica("b"))
+
+    served = [_served_by(client) for _ in range(4)]
+
+    assert served == [{"from a"}, {"from b"}, {"from a"}, {"from b"}]
+
+def test_unreachable_replica_is_marked_down(client, replicas):
+    down = create_engine(f"sqlite:////nonexistent-{uuid.uuid4().hex}/replica.db")
+    router = replicas(down, _replica("a"))
+
+    assert _served_by(client) == {"from a"}
+    assert router.healthy_replicas() == [router.replicas[1]]
+
+def test_reads_stick_to_primary_after_a_write(client, replicas):
+    replicas(_replica("a"))
+    name = f"from primary {uuid.uuid4().hex[:6]}"
+
+    response = client.post("/api/foods/", json={
+        "name": name, "calories_per_100g": 1, "protein_per_100g": 1,
+        "carbs_per_100g": 1, "fat_per_100g": 1, "fiber_per_100g": 0
+    })
+    assert database.PRIMARY_COOKIE in response.cookies
+
+    assert name in _served_by(client)
+    client.cookies.clear()
+    assert _served_by(client) == {"from a"}
@@ -0,0 +1,40 @@
+import uuid
+
+def test_logged_food_is_suggested_first(client, auth_headers):
+    headers = auth_headers()
+    prefix = uuid.uuid4().hex[:6]
+    foods = [
+        client.post("/api/foods/", json={
+            "name": f"{prefix} {name}", "calories_per_100g": 100, "protein_per_100g": 5,
+            "carbs_per_100g": 10, "fat_per_100g": 2, "fiber_per_100g": 0
+        }).json()["id"]
+        for name in ("apple", "banana")
+    ]
+    meal = client.post("/api/meals/", json={"date": "2026-05-01", "meal_type": "snack"}, headers=headers).json()
+
+    response = client.post("/api/food-entries/", json={
+        "meal_id": meal["id"], "food_id": foods[1], "quantity_grams": 120
+    }, headers=headers)
+    assert response.status_code == 201
+
+    suggestions = client.get("/api/foods/suggest", params={"q": prefix}, headers=headers).json()
+    assert [item["id"] for item in suggestions] == [foods[1], foods[0]]
+    assert suggestions[0]["use_count"] == 1
+
+def test_food_entry_can_be_updated(client, auth_headers):
+    headers = auth_headers()
+    food = client.post("/api/foods/", json={
+        "name": f"Bread {uuid.uuid4().hex[:6]}", "calories_per_100g": 250, "protein_per_100g": 9,
+        "carbs_per_100g": 49, "fat_per_100g": 3, "fiber_per_100g": 0
+    }).json()["id"]
+    meal = client.post("/api/meals/", json={"date": "2026-05-02", "meal_type": "lunch"}, headers=headers).json()
+    entry = client.post("/api/food-entries/", json={
+        "meal_id": meal["id"], "food_id": food, "quantity_grams": 100
+    }, headers=headers).json()
+
+    response = client.put(f"/api/food-entries/{entry['id']}", json={
+        "meal_id": meal["id"], "food_id": food, "quantity_grams": 200
+    }, headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["total_calories"] == 500
@@ -0,0 +1,95 @@
+import datetime as dt
+import uuid
+
+from app.core.database import SessionLocal
+from app.models.nutrition import Food, Meal
+from app.models.user import User
+
+def _food_id():
+    db = SessionLocal()
+    food = Food(name=f"Oats {uuid.uuid4().hex[:6]}", calories_per_100g=389, protein_per_100g=17,
+                carbs_per_100g=66, fat_per_100g=7, fiber_per_100g=11)
+    db.add(food)
+    db.commit()
+    food_id = food.id
+    db.close()
+    return food_id
+
+def _pull(client, headers, since=None):
+    response = client.get("/api/sync/", params={"since": since} if since else {}, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+def _create_meal(client, headers, day, meal_type="lunch"):
+    response = client.post("/api/meals/", json={"date": day, "meal_type": meal_type}, headers=headers)
+    assert response.status_code == 201
+    return response.json()["id"]
+
+def test_changes_since_token_are_versioned(client, auth_headers):
+    headers = auth_headers()
+    first = _create_meal(client, headers, "2026-01-01")
+    token = _pull(client, headers)["token"]
+
+    second = _create_meal(client, headers, "2026-01-02")
+    client.put(f"/api/meals/{first}", json={"date": "2026-01-03", "meal_type": "lunch"}, headers=headers)
+
+    changes = _pull(client, headers, token)
+    assert sorted(meal["id"] for meal in changes["meals"]) == sorted([first, second])
+    assert int(changes["token"]) > int(token)
+    assert _pull(client, headers, changes["token"])["meals"] == []
+
+def test_deletes_leave_tombstones(client, auth_headers):
+    headers = auth_headers()
+    meal_id = _create_meal(client, headers, "2026-02-01")
+    token = _pull(client, headers)["token"]
+
+    assert client.delete(f"/api/meals/{meal_id}", headers=headers).status_code == 200
+
+    changes = _pull(client, headers, token)
+    assert changes["deleted"]["meals"] == [meal_id]
+    assert changes["meals"] == []
+
+def test_full_sync_includes_unversioned_rows(client, auth_headers):
+    email = f"{uuid.uuid4().hex[:8]}@example.com"
+    headers = auth_headers(email)
+    _pull(client, headers)  # registers the user
+
+    db = SessionLocal()
+    user_id = db.query(User.id).filter(User.email == email).scalar()
+    legacy = Meal(user_id=user_id, date=dt.date(2025, 1, 1), meal_type="dinner", version=0)
+    db.add(legacy)
+    db.commit()
+
+    assert [meal["id"] for meal in _pull(client, headers)["meals"]] == [legacy.id]
+    db.close()
+
+def test_batch_applies_operations_and_reports_errors_individually(client, auth_headers):
+    headers = auth_headers()
+    food_id = _food_id()
+
+    response = client.post("/api/sync/", json={"operations": [
+        {"op": "create", "entity": "meal", "client_id": "m1", "data": {"date": "2026-03-01", "meal_type": "breakfast"}},
+        {"op": "create", "entity": "food_entry", "data": {"meal_id": "abc", "food_id": food_id, "quantity_grams": 50}},
+        {"op": "create", "entity": "food_entry", "data": {"meal_client_id": "m1", "food_id": food_id, "quantity_grams": 50}},
+        {"op": "delete", "entity": "meal", "id": 999999},
+    ]}, headers=headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert "token" not in body
+    assert [result["status"] for result in body["results"]] == ["ok", "error", "ok", "error"]
+
+    changes = _pull(client, headers)
+    assert [meal["id"] for meal in changes["meals"]] == [body["results"][0]["id"]]
+    assert [entry["meal_id"] for entry in changes["food_entries"]] == [body["results"][0]["id"]]
+
+def test_push_does_not_skip_other_devices_writes(client, auth_headers):
+    headers = auth_headers()
+    token = _pull(client, headers)["token"]
+
+    other_device = _create_meal(client, headers, "2026-04-01", "dinner")
+    client.post("/api/sync/", json={"operations": [
+        {"op": "create", "entity": "meal", "data": {"date": "2026-04-02", "meal_type": "dinner"}},
+    ]}, headers=headers)
+
+    assert other_device in [meal["id"] for meal in _pull(client, headers, token)["meals"]]
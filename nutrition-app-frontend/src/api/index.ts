@@ -2,6 +2,8 @@ import axios from 'axios'
 
 const api = axios.create({
   baseURL: 'http://localhost:8000',
+  // Send/keep the API's cookies cross-origin (read-your-writes after a save)
+  withCredentials: true,
 })
 
 // Add request interceptor for debugging